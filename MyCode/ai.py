@@ -0,0 +1,81 @@
+from constants import *
+from characters import Enemy
+from pathfinding import UNREACHABLE
+from swarm import SwarmEnemy
+
+
+class AIScheduler:
+    """
+    Уровни детализации ИИ врагов по расстоянию пути до игрока.
+
+    - ближние (до AI_NEAR_DISTANCE шагов) ходят каждый ход как обычно;
+    - средние (до AI_MID_DISTANCE) ходят раз в AI_MID_PERIOD ходов,
+      зато сразу на AI_MID_PERIOD клеток (грубый ход, coarse_update);
+    - дальние спят.
+
+    Будят и усыпляют по одной мере — расстоянию пути. Пространственный
+    индекс Board даёт кандидатов в радиусе AI_MID_DISTANCE клеток (путь
+    не короче манхэттенского расстояния), просыпаются те, до кого путь
+    не длиннее AI_MID_DISTANCE, а отставшие дальше засыпают снова.
+
+    Board строит поле расстояний только на AI_MID_DISTANCE шагов от игрока
+    (distance_limit), так что стоимость хода зависит от числа врагов рядом,
+    а не от всех.
+    """
+    def __init__(self, board) -> None:
+        self.board = board
+        self.turn = 0
+        # Проснувшиеся враги -> их сдвиг в цикле средних ходов,
+        # чтобы средние враги ходили не все в один ход
+        self.awake = {}
+        self.next_phase = 0
+
+    def wake_up(self, px: int, py: int, field) -> None:
+        """Будит спящих врагов, до которых от игрока не дальше AI_MID_DISTANCE шагов."""
+        width = self.board.map_data.width
+        for entity in self.board.entities_in_radius(px, py, AI_MID_DISTANCE):
+            if not isinstance(entity, (Enemy, SwarmEnemy)) or entity in self.awake:
+                continue
+            if not entity.is_alive():
+                entity.kill()
+                continue
+            tx, ty = entity.tile
+            if field[ty * width + tx] == UNREACHABLE:
+                continue
+            self.awake[entity] = self.next_phase
+            self.next_phase = (self.next_phase + 1) % AI_MID_PERIOD
+
+    def update(self, player) -> None:
+        """Ход всех проснувшихся врагов по их уровням."""
+        board = self.board
+        self.turn += 1
+        px, py = player.rect.x // TILE_SIZE, player.rect.y // TILE_SIZE
+        field = board.get_distance_field((px, py))
+        self.wake_up(px, py, field)
+
+        width = board.map_data.width
+        near = []
+        mid = []
+        for enemy, phase in list(self.awake.items()):
+            if not enemy.is_alive():
+                enemy.kill()
+                del self.awake[enemy]
+                continue
+            tx, ty = enemy.tile
+            dist = field[ty * width + tx]
+            if dist == UNREACHABLE:
+                # Отстал дальше AI_MID_DISTANCE или отрезан — засыпает
+                del self.awake[enemy]
+            elif dist <= AI_NEAR_DISTANCE:
+                near.append(enemy)
+            elif (self.turn + phase) % AI_MID_PERIOD == 0:
+                mid.append(enemy)
+
+        if board.swarm:
+            board.swarm.update(player, board, [enemy.slot for enemy in near])
+            board.swarm.update(player, board, [enemy.slot for enemy in mid], AI_MID_PERIOD)
+            return
+        for enemy in near:
+            enemy.update(player, board)
+        for enemy in mid:
+            enemy.coarse_update(player, board, AI_MID_PERIOD)
@@ -0,0 +1,211 @@
+import os
+
+import pygame
+from constants import TILE_SIZE, IMAGES_DIR, TILESETS_DIR, ATLAS_WIDTH, ATLAS_MAX_HEIGHT
+
+
+# Кадры игрока: направление -> (idle-кадр, шаблон имени кадров ходьбы) в AssetManager
+PLAYER_FRAME_FILES = {
+    'down': ('player/player_d1', 'player/player_rd/player_rd_0{}'),
+    'up': ('player/player_u1', 'player/player_ru/player_ru_0{}'),
+    'left': ('player/player_l1', 'player/player_rl/player_rl_0{}'),
+    'right': ('player/player_r1', 'player/player_rr/player_rr_0{}'),
+}
+WALK_FRAMES = 8
+
+
+def asset_key(path: str) -> str:
+    """Ключ файла: полный путь в нижнем регистре (Player/ и player/ — одно и то же)."""
+    return os.path.normcase(os.path.abspath(path)).lower()
+
+
+class AssetManager:
+    """
+    Все картинки игры в одной или нескольких страницах-атласах.
+
+    Каждый PNG из IMAGES_DIR и TILESETS_DIR грузится с диска один раз
+    и копируется в страницу атласа (укладка полками: картинки по убыванию
+    высоты, слева направо). Наружу отдаются subsurface страниц:
+
+    - image(name): по логическому имени — путь внутри папки без расширения
+      в нижнем регистре, например 'ground/ground1' или 'player/player_rd/player_rd_00';
+    - by_path(path): по пути к файлу, регистр букв не важен;
+    - по gid: CompiledMap.load_images(assets) режет тайлсет карты из атласа.
+
+    add(name, surface) кладёт в атлас картинку, нарисованную в коде:
+    в свободный остаток одной из полок, а если нигде не влезает —
+    на новую страницу ровно по её размеру.
+    texture_memory() — сколько байт занимают все страницы.
+    """
+    def __init__(self, folders: tuple[str, ...] = (IMAGES_DIR, TILESETS_DIR)) -> None:
+        self.pages = []
+        self.images = {}
+        # asset_key(путь к файлу) -> логическое имя
+        self.paths = {}
+        # Полки всех страниц: [страница, x свободного места, y, высота]
+        self.shelves = []
+
+        files = []
+        for folder in folders:
+            for root, _, file_names in os.walk(folder):
+                for file_name in sorted(file_names):
+                    if not file_name.lower().endswith('.png'):
+                        continue
+                    path = os.path.join(root, file_name)
+                    name = os.path.splitext(os.path.relpath(path, folder))[0]
+                    files.append((name.replace(os.sep, '/').lower(), path,
+                                  pygame.image.load(path).convert_alpha()))
+
+        # Высокие картинки первыми — так полки меньше пустуют
+        files.sort(key=lambda item: -item[2].get_height())
+        places, heights = self.pack([image.get_size() for _, _, image in files])
+        for height in heights:
+            self.pages.append(pygame.Surface((ATLAS_WIDTH, height), pygame.SRCALPHA))
+        shelves = {}
+        for (name, path, image), place in zip(files, places):
+            self.paths[asset_key(path)] = name
+            self.put(name, image, place)
+            # Первая картинка полки самая высокая — по ней высота полки
+            page, x, y = place
+            shelf = shelves.setdefault((page, y), [page, 0, y, image.get_height()])
+            shelf[1] = x + image.get_width()
+        self.shelves = list(shelves.values())
+
+    @staticmethod
+    def pack(sizes: list[tuple[int, int]]):
+        """
+        Раскладывает картинки sizes полками по страницам шириной ATLAS_WIDTH.
+        Возвращает места (страница, x, y) и высоты страниц.
+        """
+        places = []
+        heights = [0]
+        x = y = shelf_height = 0
+        for width, height in sizes:
+            if x + width > ATLAS_WIDTH:
+                # Полка заполнена — новая полка под ней
+                x, y = 0, y + shelf_height
+                shelf_height = 0
+            if y and y + max(height, shelf_height) > ATLAS_MAX_HEIGHT:
+                # Страница заполнена — новая страница
+                heights.append(0)
+                x = y = shelf_height = 0
+            shelf_height = max(shelf_height, height)
+            places.append((len(heights) - 1, x, y))
+            heights[-1] = max(heights[-1], y + shelf_height)
+            x += width
+        return places, heights
+
+    def put(self, name: str, image: pygame.Surface, place: tuple[int, int, int]) -> None:
+        """Копирует image в атлас на место place и запоминает её subsurface."""
+        page, x, y = place
+        cell = pygame.Rect((x, y), image.get_size())
+        # Страница пустая, MAX копирует пиксели вместе с прозрачностью
+        self.pages[page].blit(image, cell, special_flags=pygame.BLEND_RGBA_MAX)
+        self.images[name] = self.pages[page].subsurface(cell)
+
+    def add(self, name: str, image: pygame.Surface) -> pygame.Surface:
+        """
+        Кладёт в атлас картинку, нарисованную в коде (если имени ещё нет).
+        Она занимает остаток самой низкой полки, где хватает места,
+        а если такой нет — новую страницу ровно по своему размеру.
+        """
+        name = name.lower()
+        if name not in self.images:
+            width, height = image.get_size()
+            fits = [shelf for shelf in self.shelves
+                    if height <= shelf[3] and shelf[1] + width <= self.pages[shelf[0]].get_width()]
+            if fits:
+                shelf = min(fits, key=lambda shelf: shelf[3])
+                place = (shelf[0], shelf[1], shelf[2])
+                shelf[1] += width
+            else:
+                self.pages.append(pygame.Surface((width, height), pygame.SRCALPHA))
+                place = (len(self.pages) - 1, 0, 0)
+                self.shelves.append([place[0], width, 0, height])
+            self.put(name, image, place)
+        return self.images[name]
+
+    def image(self, name: str) -> pygame.Surface:
+        """Картинка по логическому имени (регистр не важен)."""
+        return self.images[name.lower()]
+
+    def by_path(self, path: str) -> pygame.Surface:
+        """
+        Картинка по пути к файлу. Файл не из папок атласа
+        (например, тайлсет тестовой карты) грузится и добавляется один раз.
+        """
+        key = asset_key(path)
+        name = self.paths.get(key)
+        if name is None:
+            name = key
+            self.paths[key] = name
+            self.add(name, pygame.image.load(path).convert_alpha())
+        return self.images[name]
+
+    def texture_memory(self) -> int:
+        """Сколько байт пикселей занимают все страницы атласа."""
+        return sum(page.get_width() * page.get_height() * page.get_bytesize() for page in self.pages)
+
+
+# Один менеджер картинок на весь процесс (создаётся при первом обращении,
+# после pygame.display.set_mode — convert_alpha нужен экран)
+ASSETS = None
+
+
+def asset_manager() -> AssetManager:
+    """Общий AssetManager для Board, Player и снарядов."""
+    global ASSETS
+    if ASSETS is None:
+        ASSETS = AssetManager()
+    return ASSETS
+
+
+class FrameAtlas:
+    """
+    Кадры анимации игрока из общего AssetManager.
+
+    Кадры — subsurface атласа, так что анимация только меняет ссылку
+    на кадр. Если нужен другой размер, масштабированная копия кадра
+    один раз добавляется в тот же атлас.
+
+    - idle: направление -> кадр
+    - walk: направление -> список кадров ходьбы
+    """
+    def __init__(self, size: tuple[int, int] = (TILE_SIZE, TILE_SIZE)) -> None:
+        assets = asset_manager()
+        self.idle = {}
+        self.walk = {}
+
+        for direction, (idle_name, walk_pattern) in PLAYER_FRAME_FILES.items():
+            names = [idle_name] + [walk_pattern.format(i) for i in range(WALK_FRAMES)]
+            frames = []
+            for name in names:
+                image = assets.image(name)
+                if image.get_size() != size:
+                    image = assets.add(f'{name}@{size[0]}x{size[1]}',
+                                       pygame.transform.scale(image, size))
+                frames.append(image)
+            self.idle[direction] = frames[0]
+            self.walk[direction] = frames[1:]
+
+
+# Один атлас кадров игрока на весь процесс (создаётся при первом Player)
+PLAYER_ATLAS = None
+
+
+def player_atlas() -> FrameAtlas:
+    """Общий атлас кадров игрока; второй Player ничего не грузит заново."""
+    global PLAYER_ATLAS
+    if PLAYER_ATLAS is None:
+        PLAYER_ATLAS = FrameAtlas()
+    return PLAYER_ATLAS
+
+
+if __name__ == '__main__':
+    # Сводка по атласу: python assets.py
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    manager = asset_manager()
+    for i, page in enumerate(manager.pages):
+        print(f"page {i}: {page.get_width()}x{page.get_height()}")
+    print(f"{len(manager.images)} images, texture memory {manager.texture_memory() / 2 ** 20:.1f} MiB")
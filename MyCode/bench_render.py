@@ -0,0 +1,122 @@
+"""
+Замер отрисовки Board: старый путь (blit на каждый чанк и спрайт,
+Rect из camera.apply на каждый спрайт) против Board.draw
+(один Surface.blits на слой, позиции без Rect).
+
+Запуск из MyCode: python bench_render.py [число врагов] [число кадров]
+Каждая карта считается в отдельном процессе: размер карты
+задаётся в constants.py при импорте.
+"""
+import os
+import subprocess
+import sys
+import time
+
+# Карты для замера: путь -> размер в тайлах
+BENCH_MAPS = {
+    '../Maps/name_tmx/map4.tmx': (50, 35),
+    '../Maps/name_tmx/map2.tmx': (100, 100),
+}
+
+
+def bench_map(tmx_path: str, enemy_count: int, frames: int) -> None:
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import constants
+
+    # Подменяем карту до импорта модулей, которые берут размеры из constants
+    constants.MAP = tmx_path
+    constants.MAP_SIZE = BENCH_MAPS[tmx_path]
+    constants.MAP_WIDTH = constants.MAP_SIZE[0] * constants.TILE_SIZE
+    constants.MAP_HEIGHT = constants.MAP_SIZE[1] * constants.TILE_SIZE
+
+    from constants import GREEN, CHUNK_SIZE, SIZE, WIDTH, HEIGHT, MAP_WIDTH, MAP_HEIGHT
+    from camera import Camera
+    from board import Board
+    from characters import Player, WeakEnemy, StrongEnemy
+
+    class CountingSurface(pygame.Surface):
+        """Поверхность, которая считает вызовы blit и blits на себя."""
+        calls = 0
+
+        def blit(self, *args, **kwargs):
+            self.calls += 1
+            return super().blit(*args, **kwargs)
+
+        def blits(self, *args, **kwargs):
+            self.calls += 1
+            return super().blits(*args, **kwargs)
+
+    pygame.init()
+    display = pygame.display.set_mode(SIZE)
+    # Оба пути рисуют на поверхность того же формата, что экран, и она считает вызовы
+    screen = CountingSurface(SIZE, 0, display)
+    camera = Camera(MAP_WIDTH, MAP_HEIGHT)
+    board = Board(screen, camera)
+    board.player = Player(0, 0, board.entity_group)
+    for i in range(enemy_count):
+        board.spawn(WeakEnemy if i % 2 else StrongEnemy, board.entity_group)
+
+    # Камера посередине карты
+    camera.x = -(MAP_WIDTH - WIDTH) // 2
+    camera.y = -(MAP_HEIGHT - HEIGHT) // 2
+    camera.camera_rect = pygame.Rect(camera.x, camera.y, MAP_WIDTH, MAP_HEIGHT)
+
+    # Считаем Rect, которые выдаёт camera.apply
+    rects = [0]
+    apply = camera.apply
+
+    def counting_apply(entity):
+        rects[0] += 1
+        return apply(entity)
+    camera.apply = counting_apply
+
+    def old_draw() -> None:
+        """Отрисовка как до Surface.blits: blit на каждый чанк, спрайт и снаряд."""
+        x0, y0, x1, y1 = camera.visible_tiles(margin=0)
+        for cy in range(y0 // CHUNK_SIZE, (y1 - 1) // CHUNK_SIZE + 1):
+            for cx in range(x0 // CHUNK_SIZE, (x1 - 1) // CHUNK_SIZE + 1):
+                screen.blit(board.chunks[(cx, cy)],
+                            (cx * board.chunk_px + camera.x, cy * board.chunk_px + camera.y))
+        for sprite in board.entity_group:
+            screen.blit(sprite.image, camera.apply(sprite))
+        for image, pos in board.projectiles.blit_list(camera):
+            screen.blit(image, pos)
+
+    # Чанки карты рисуются лениво — при первой отрисовке
+    board.draw()
+
+    results = {}
+    pictures = {}
+    for name, draw in (('old', old_draw), ('new', board.draw)):
+        screen.fill(GREEN)
+        draw()
+        pictures[name] = pygame.image.tobytes(screen, 'RGB')
+
+        rects[0] = 0
+        screen.calls = 0
+        start = time.perf_counter()
+        for _ in range(frames):
+            screen.fill(GREEN)
+            draw()
+        elapsed = time.perf_counter() - start
+        results[name] = (elapsed / frames * 1000, screen.calls / frames, rects[0] / frames)
+
+    width, height = BENCH_MAPS[tmx_path]
+    visible = sum(len(layer) for layer in board.entity_layers())
+    print(f"{os.path.basename(tmx_path)} ({width}x{height}), "
+          f"{len(board.entity_group)} sprites ({visible} in view), {frames} frames")
+    for name, (ms, calls, rect_count) in results.items():
+        print(f"  {name}: {ms:.3f} ms/frame, {calls:.0f} blit calls/frame, "
+              f"{rect_count:.0f} Rect allocations/frame")
+    print(f"  same picture: {'yes' if pictures['old'] == pictures['new'] else 'NO'}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1].endswith('.tmx'):
+        bench_map(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]))
+    else:
+        enemy_count = sys.argv[1] if len(sys.argv) > 1 else '300'
+        frames = sys.argv[2] if len(sys.argv) > 2 else '500'
+        for tmx_file in BENCH_MAPS:
+            subprocess.run([sys.executable, __file__, tmx_file, enemy_count, frames], check=True)
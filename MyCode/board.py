@@ -1,102 +1,154 @@
 import pygame
 import random
+from contextlib import contextmanager
 
-from pytmx.util_pygame import load_pygame
+from map_cache import load_map
+from grid import TileGrid
+from pathfinding import distance_field, astar, manhattan, PathCache
+from hpa import HierarchicalPlanner, HierarchicalPath
+from connectivity import ConnectivityLabels
+from occupancy import SpatialGroup, FreeCells, blocks
+from swarm import EnemySwarm
+from ai import AIScheduler
+from terrain_sim import TerrainSim
+from projectile import ProjectileSystem
+from assets import asset_manager
 from characters import *
 from constants import *
-from spells import Elements
-
-
-class Tile(pygame.sprite.Sprite):
-    """Простой спрайт тайла."""
-    def __init__(self, pos: tuple[int, int], surf: pygame.Surface,
-                 group: pygame.sprite.Group) -> None:
-        super().__init__(group)
-        self.image = surf
-        self.rect = self.image.get_rect(topleft=pos)
+from spells import ELEMENTS
 
 
 class Board:
     """
     Класс для загрузки Tiled-карты (TMX), хранения map_data (коды тайлов),
-    групп спрайтов (tile_group, entity_group) и функций
+    заранее отрисованных чанков карты, группы спрайтов entity_group и функций
     по изменению тайлов (set_tile) и отрисовке (draw).
     """
     def __init__(self, screen: pygame.Surface, camera) -> None:
         self.screen = screen
         self.camera = camera
 
-        # Грузим TMX
-        self.tmx_data = load_pygame(MAP)
+        # Грузим карту (из бинарного кэша, а если он устарел — из TMX)
+        self.map_source = load_map(MAP)
 
         # Размер карты в пикселях
         self.width = MAP_WIDTH
         self.height = MAP_HEIGHT
 
-        # Группы для спрайтов
-        self.tile_group = pygame.sprite.Group()    # все тайлы
-        self.entity_group = pygame.sprite.Group()  # игрок, враги, снаряды и т.д.
+        # Группа для спрайтов: игрок, враги, снаряды и т.д.
+        # Заодно это пространственный хэш — кто стоит в какой клетке
+        self.entity_group = SpatialGroup()
 
         # Данные карты (коды тайлов)
-        self.map_data = [[0 for _ in range(MAP_SIZE[0])] for _ in range(MAP_SIZE[1])]
-        # Спрайты-тайлы
-        self.sprite_map = [[None for _ in range(MAP_SIZE[0])] for _ in range(MAP_SIZE[1])]
+        self.map_data = TileGrid(MAP_SIZE[0], MAP_SIZE[1])
+        # Слои TMX каждой клетки склеиваются при загрузке в одну картинку.
+        # Одинаковые наборы слоёв (снизу вверх) склеиваются один раз:
+        # stacks[i] — набор слоёв, stack_surfaces[i] — его готовая картинка,
+        # а stack_map хранит для клетки только номер набора.
+        self.stacks = [()]
+        self.stack_ids = {(): 0}
+        self.stack_surfaces = [None]
+        self.stack_map = [[0 for _ in range(MAP_SIZE[0])] for _ in range(MAP_SIZE[1])]
+
+        # Карта заранее рисуется в чанки CHUNK_SIZE x CHUNK_SIZE тайлов.
+        # set_tile помечает свой чанк "грязным", и он перерисовывается
+        # перед следующим показом на экране.
+        self.chunk_px = CHUNK_SIZE * TILE_SIZE
+        self.chunks = {}
+        self.dirty_chunks = set()
+
+        # Версия карты: увеличивается при каждом set_tile,
+        # по ней сбрасываются поле расстояний и кэш путей
+        self.terrain_version = 0
+
+        # Клетки, изменённые внутри batch(), -> была ли клетка проходима до изменений
+        self.changed_tiles = {}
+        self.batch_depth = 0
+        # Клетки, изменившиеся с прошлого кадра, — их забирает отрисовка (см. renderer)
+        self.redraw_tiles = set()
+
+        # Общее для всех врагов поле расстояний до игрока (см. get_distance_field).
+        # Дальше distance_limit шагов поле не строится (None — вся карта):
+        # с AI_LOD дальше AI_MID_DISTANCE враги спят и поле им не нужно
+        self.distance_field = None
+        self.distance_key = None
+        self.distance_limit = AI_MID_DISTANCE if AI_LOD else None
+
+        # Кэш путей (см. find_path)
+        self.path_cache = PathCache(PATH_CACHE_SIZE)
 
         # В будущем сохраним игрока и список врагов
         self.player = None
         self.enemies = []
+        # Если включён ENEMY_SWARM, враги живут в массивах роя, а в enemies — их фасады
+        self.swarm = EnemySwarm() if ENEMY_SWARM else None
 
-        # Для случайного выбора одного из нескольких тайлов (пример)
-        self.random_number = 1
-
-        # Подгрузка изображений для разных тайлов
+        # Картинки для разных тайлов — из общего атласа
+        self.assets = asset_manager()
         self.tile_surfaces = {
-            0: pygame.image.load(f"../Images/ground/ground{self.random_number}.png").convert_alpha(),
-            1: pygame.image.load("../Images/ground/fire_ground.png").convert_alpha(),
-            2: pygame.image.load("../Images/ground/water_ground.png").convert_alpha(),
-            3: pygame.image.load("../Images/full_tree/Top_left_tree.png").convert_alpha(),   # дерево (условно)
-            4: pygame.image.load("../Images/full_fire_tree/Top_left_fire_tree.png").convert_alpha(),
-            5: pygame.image.load(f"../Images/main_pngs/rock{self.random_number}.png").convert_alpha(),
-            6: pygame.image.load("../Images/main_pngs/water.png").convert_alpha(),
-            7: pygame.image.load("../Images/main_pngs/magma.png").convert_alpha(),
+            0: self.assets.image('ground/ground1'),
+            1: self.assets.image('ground/fire_ground'),
+            2: self.assets.image('ground/water_ground'),
+            3: self.assets.image('full_tree/top_left_tree'),   # дерево (условно)
+            4: self.assets.image('full_fire_tree/top_left_fire_tree'),
+            5: self.assets.image('main_pngs/rock1'),
+            6: self.assets.image('main_pngs/water'),
+            7: self.assets.image('main_pngs/magma'),
         }
 
-        # Ссылка на класс заклинаний
-        self.spell_class = Elements
+        # Общий обработчик заклинаний и все снаряды на карте
+        self.spells = ELEMENTS
+        self.projectiles = ProjectileSystem(self)
 
         # Отрисовываем карту из TMX
         self.draw_map()
 
+        # Свободные клетки (проходимые и без персонажа) для спавна
+        self.free_cells = FreeCells(self.map_data)
+        self.entity_group.free_cells = self.free_cells
+        if self.swarm:
+            self.swarm.free_cells = self.free_cells
+
+        # Связные области проходимых клеток: недостижимая цель отсекается сразу
+        self.connectivity = ConnectivityLabels(self.map_data)
+
+        # Клеточный автомат местности (огонь, вода, магма) — шаг в update_terrain
+        self.terrain = TerrainSim(self) if TERRAIN_SIM else None
+
+        # Планировщик ходов врагов по расстоянию до игрока (дальние спят)
+        self.ai = AIScheduler(self) if AI_LOD else None
+
+        # Иерархический планировщик путей — только для больших карт.
+        # Строится сразу при загрузке, а не посреди хода. С AI_LOD он не нужен:
+        # ходят только враги ближе AI_MID_DISTANCE шагов, а дальние запросы
+        # начинаются с HPA_MIN_DISTANCE
+        self.planner = None
+        if max(MAP_SIZE) >= HPA_MIN_MAP_SIZE and not AI_LOD:
+            self.planner = HierarchicalPlanner(self.map_data)
+
     def draw_map(self) -> None:
-        """Считываем слои TMX и создаём спрайты тайлов."""
-        for layer in self.tmx_data.visible_layers:
-            if hasattr(layer, "tiles"):
-                for x, y, surf in layer.tiles():
-                    pos = (x * TILE_SIZE, y * TILE_SIZE)
-                    tile_code = 0  # по умолчанию
-
-                    # Пример, как определять tile_code по имени слоя:
-                    if layer.name == 'Ground':
-                        tile_code = 0
-                    elif layer.name == 'Fire_ground':
-                        tile_code = 1
-                    elif layer.name == 'Water_ground':
-                        tile_code = 2
-                    elif layer.name == 'Tree':
-                        tile_code = 3
-                    elif layer.name == 'Fire_tree':
-                        tile_code = 4
-                    elif layer.name == 'Rock':
-                        tile_code = 5
-                    elif layer.name == 'Water':
-                        tile_code = 6
-                    elif layer.name == 'Magma':
-                        tile_code = 7
-
-                    self.map_data[y][x] = tile_code
-
-                    tile = Tile(pos, surf, self.tile_group)
-                    self.sprite_map[y][x] = tile
+        """Раскладываем коды тайлов и склеиваем слои каждой клетки в одну картинку."""
+        source = self.map_source
+        images = source.load_images(self.assets)
+        width = source.width
+
+        layers = [[[] for _ in range(MAP_SIZE[0])] for _ in range(MAP_SIZE[1])]
+        for y in range(source.height):
+            for x in range(width):
+                i = y * width + x
+                self.map_data.set(x, y, source.codes[i])
+                for grid in source.layers:
+                    if grid[i]:
+                        layers[y][x].append(images[grid[i]])
+
+        for y, row in enumerate(layers):
+            for x, cell_layers in enumerate(row):
+                self.stack_map[y][x] = self.get_stack_id(tuple(cell_layers))
+
+        # Все чанки нужно нарисовать
+        for cy in range((MAP_SIZE[1] + CHUNK_SIZE - 1) // CHUNK_SIZE):
+            for cx in range((MAP_SIZE[0] + CHUNK_SIZE - 1) // CHUNK_SIZE):
+                self.dirty_chunks.add((cx, cy))
 
         # Обработка объектов (спавн игрока, врагов и т.п.)
         '''for obj in self.tmx_data.objects:
@@ -110,74 +162,311 @@ class Board:
                     enemy = StrongEnemy(int(obj.x), int(obj.y), self.entity_group)
                     self.enemies.append(enemy)'''
 
+    def get_stack_id(self, stack: tuple) -> int:
+        """
+        Возвращает номер набора слоёв stack.
+        Новый набор один раз склеивается в общую картинку.
+        """
+        stack_id = self.stack_ids.get(stack)
+        if stack_id is not None:
+            return stack_id
+
+        if len(stack) == 1:
+            surf = stack[0]
+        else:
+            surf = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+            for layer_surf in stack:
+                surf.blit(layer_surf, (0, 0))
+
+        stack_id = len(self.stacks)
+        self.stacks.append(stack)
+        self.stack_ids[stack] = stack_id
+        self.stack_surfaces.append(surf)
+        return stack_id
+
+    def render_chunk(self, cx: int, cy: int) -> None:
+        """(Пере)рисовывает чанк (cx, cy) в его поверхность."""
+        x0 = cx * CHUNK_SIZE
+        y0 = cy * CHUNK_SIZE
+        x1 = min(x0 + CHUNK_SIZE, MAP_SIZE[0])
+        y1 = min(y0 + CHUNK_SIZE, MAP_SIZE[1])
+
+        chunk = self.chunks.get((cx, cy))
+        if chunk is None:
+            size = ((x1 - x0) * TILE_SIZE, (y1 - y0) * TILE_SIZE)
+            chunk = pygame.Surface(size, pygame.SRCALPHA)
+            self.chunks[(cx, cy)] = chunk
+        else:
+            chunk.fill((0, 0, 0, 0))
+
+        for y in range(y0, y1):
+            row = self.stack_map[y]
+            for x in range(x0, x1):
+                surf = self.stack_surfaces[row[x]]
+                if surf is not None:
+                    chunk.blit(surf, ((x - x0) * TILE_SIZE, (y - y0) * TILE_SIZE))
+
+        self.dirty_chunks.discard((cx, cy))
+
     def draw(self) -> None:
-        """Сначала рисуем все тайлы, затем всех персонажей и снаряды."""
-        for sprite in self.tile_group:
-            self.screen.blit(sprite.image, self.camera.apply(sprite))
+        """
+        Сначала рисуем чанки карты, попадающие в окно камеры,
+        затем всех персонажей и снаряды.
+        """
+        self.draw_tiles(self.screen, self.screen.get_rect())
+        for layer in self.entity_layers():
+            self.screen.blits(layer, doreturn=False)
+
+    def draw_tiles(self, surface: pygame.Surface, area: pygame.Rect,
+                   offset: tuple[int, int] = (0, 0)) -> None:
+        """
+        Рисует на surface чанки карты, попадающие в прямоугольник area этой поверхности.
+        offset — где на surface левый верхний угол окна камеры (у буфера больше экрана).
+        """
+        left = self.camera.x + offset[0]
+        top = self.camera.y + offset[1]
+        x0 = max(0, (area.left - left) // TILE_SIZE)
+        y0 = max(0, (area.top - top) // TILE_SIZE)
+        x1 = min(MAP_SIZE[0], (area.right - 1 - left) // TILE_SIZE + 1)
+        y1 = min(MAP_SIZE[1], (area.bottom - 1 - top) // TILE_SIZE + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        chunk_px = self.chunk_px
+        blits = []
+        for cy in range(y0 // CHUNK_SIZE, (y1 - 1) // CHUNK_SIZE + 1):
+            for cx in range(x0 // CHUNK_SIZE, (x1 - 1) // CHUNK_SIZE + 1):
+                if (cx, cy) in self.dirty_chunks:
+                    self.render_chunk(cx, cy)
+                blits.append((self.chunks[(cx, cy)], (cx * chunk_px + left, cy * chunk_px + top)))
+        surface.blits(blits, doreturn=False)
 
-        for sprite in self.entity_group:
-            self.screen.blit(sprite.image, self.camera.apply(sprite))
+    def entity_layers(self) -> list[list[tuple[pygame.Surface, tuple[int, int]]]]:
+        """
+        Слои персонажей и снарядов в окне камеры, в порядке отрисовки.
+        Слой — список пар (картинка, позиция на экране) для одного Surface.blits.
+        Позиции считаются из клетки и смещения камеры, без Rect на каждый спрайт.
+        """
+        x0, y0, x1, y1 = self.camera.visible_tiles(margin=0)
+        left, top = self.camera.x, self.camera.y
+        layers = [[(sprite.image, (sprite.rect.x + left, sprite.rect.y + top))
+                   for sprite in self.entity_group.in_rect(x0, y0, x1, y1)]]
+        if self.swarm:
+            layers.append(self.swarm.blit_list(self.camera))
+        layers.append(self.projectiles.blit_list(self.camera))
+        return layers
 
     def set_tile(self, tile_x: int, tile_y: int, tile_type: int) -> None:
         """
         Меняет тайл на карте на новый тип.
-        Перерисовывает его спрайт.
+        Заменяет верхний слой клетки и помечает её чанк для перерисовки.
         """
-        if not (0 <= tile_x < MAP_SIZE[0] and 0 <= tile_y < MAP_SIZE[1]):
+        self.set_tiles(((tile_x, tile_y, tile_type),))
+
+    def set_tiles(self, tiles) -> None:
+        """
+        Меняет сразу много тайлов: tiles — последовательность (x, y, код).
+        Сначала меняется сетка, затем один общий пересчёт (см. batch).
+        """
+        with self.batch():
+            for tile_x, tile_y, tile_type in tiles:
+                self.write_tile(tile_x, tile_y, tile_type)
+
+    @contextmanager
+    def batch(self):
+        """
+        Все set_tile/set_tiles внутри `with board.batch():` только меняют
+        сетку. Чанки, проходимость, связность, свободные клетки и версия
+        карты пересчитываются один раз на выходе из самого внешнего batch.
+        """
+        self.batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.batch_depth -= 1
+            if self.batch_depth == 0:
+                self.flush_tiles()
+
+    def write_tile(self, tile_x: int, tile_y: int, tile_type: int) -> None:
+        """Меняет код и картинку клетки, запоминая её прежнюю проходимость."""
+        if not self.map_data.in_bounds(tile_x, tile_y):
             return
 
-        old_sprite = self.sprite_map[tile_y][tile_x]
-        if old_sprite:
-            old_sprite.kill()
+        stack = self.stacks[self.stack_map[tile_y][tile_x]]
+        stack = stack[:-1] + (self.get_tile_surface(tile_type),)
+
+        self.changed_tiles.setdefault((tile_x, tile_y),
+                                      self.map_data.is_passable(tile_x, tile_y))
+        self.map_data.set(tile_x, tile_y, tile_type)
+        self.stack_map[tile_y][tile_x] = self.get_stack_id(stack)
+
+    def flush_tiles(self) -> None:
+        """Общий пересчёт после изменения клеток changed_tiles."""
+        if not self.changed_tiles:
+            return
+        if self.terrain:
+            self.terrain.touch(self.changed_tiles)
+
+        flipped = []
+        for (tile_x, tile_y), was_passable in self.changed_tiles.items():
+            self.dirty_chunks.add((tile_x // CHUNK_SIZE, tile_y // CHUNK_SIZE))
+            self.redraw_tiles.add((tile_x, tile_y))
+            if was_passable != self.map_data.is_passable(tile_x, tile_y):
+                flipped.append((tile_x, tile_y))
+
+        # Метки связности — одним обновлением на весь batch
+        self.connectivity.update_many(flipped)
+        for tile_x, tile_y in flipped:
+            if not self.map_data.is_passable(tile_x, tile_y):
+                self.free_cells.discard((tile_x, tile_y))
+            elif not self.is_occupied(tile_x, tile_y):
+                self.free_cells.add((tile_x, tile_y))
+            if self.planner:
+                self.planner.invalidate(tile_x, tile_y)
+        self.changed_tiles.clear()
+
+        # Карта изменилась — поле расстояний и пути нужно строить заново
+        self.terrain_version += 1
 
-        self.map_data[tile_y][tile_x] = tile_type
-        pos_px = (tile_x * TILE_SIZE, tile_y * TILE_SIZE)
+    def get_distance_field(self, target: tuple[int, int]):
+        """
+        Поле расстояний от клетки target (обычно клетка игрока) до всех клеток.
+        Строится одним обратным BFS и переиспользуется всеми врагами,
+        пока не сдвинется цель или не изменится карта.
+        """
+        key = (target, self.terrain_version, self.distance_limit)
+        if self.distance_key != key:
+            self.distance_field = distance_field(target, self.map_data, self.distance_limit)
+            self.distance_key = key
+        return self.distance_field
 
-        new_surf = self.get_tile_surface(tile_type)
-        new_sprite = Tile(pos_px, new_surf, self.tile_group)
-        self.sprite_map[tile_y][tile_x] = new_sprite
+    def find_path(self, start: tuple[int, int], goal: tuple[int, int],
+                  blocked=None) -> list[tuple[int, int]] | HierarchicalPath | None:
+        """
+        Путь A* от start до goal в обход blocked.
+        Дальние запросы без blocked на больших картах идут через HPA*
+        и возвращают HierarchicalPath, уточнённый только до первого входа.
+        Результат запоминается в кэше путей до следующего изменения карты.
+        Если start и goal в разных связных областях, сразу возвращает None.
+        """
+        if not self.connectivity.connected(start, goal):
+            return None
+        blocked = frozenset(blocked) if blocked else frozenset()
+        key = (start, goal, self.terrain_version, blocked)
+        found, path = self.path_cache.get(key)
+        if not found:
+            if (self.planner and not blocked
+                    and manhattan(start[0], start[1], goal[0], goal[1]) >= HPA_MIN_DISTANCE):
+                path = self.planner.find_path(start, goal)
+            else:
+                path = astar(start, goal, self.map_data, blocked)
+            self.path_cache.put(key, path)
+        return path
 
     def get_tile_surface(self, code: int) -> pygame.Surface:
         """
         Возвращает нужный Surface для тайла с кодом code.
         """
-        if code == 0:
-            self.random_number = random.choice((1, 2))
-        elif code == 5:
-            self.random_number = random.choice((1, 2, 3, 4))
-            # Остальные коды
         return self.tile_surfaces[code]
 
-    def spawn(self, enemy_class, group) -> "Enemy":
-        """
-        Спавнит врага случайно на проходимом тайле,
-        где нет других врагов и нет игрока.
-        Возвращает созданного врага.
-        """
-        while True:
-            tx = random.randint(0, MAP_SIZE[0] - 1)
-            ty = random.randint(0, MAP_SIZE[1] - 1)
-            # Проверяем, что тайл проходим
-            if self.map_data[ty][tx] in IS_PASSABLE:
-                # Проверяем, не стоит ли там игрок
-                if self.player:
-                    px = self.player.rect.x // TILE_SIZE
-                    py = self.player.rect.y // TILE_SIZE
-                    if (px, py) == (tx, ty):
-                        continue
-                # Проверяем, нет ли там врага
-                collision = False
-                for e in self.enemies:
-                    ex = e.rect.x // TILE_SIZE
-                    ey = e.rect.y // TILE_SIZE
-                    if (ex, ey) == (tx, ty):
-                        collision = True
-                        break
-
-                if not collision:
-                    # Создаём врага
-                    x_px = tx * TILE_SIZE
-                    y_px = ty * TILE_SIZE
-                    enemy = enemy_class(x_px, y_px, group)
-                    self.enemies.append(enemy)
-                    return enemy
\ No newline at end of file
+    def entities_at(self, tx: int, ty: int) -> list:
+        """Все персонажи и снаряды в клетке (tx, ty)."""
+        result = self.entity_group.entities_at(tx, ty)
+        if self.swarm:
+            result.extend(self.swarm.entities_at(tx, ty))
+        return result
+
+    def enemies_at(self, tx: int, ty: int) -> list:
+        """Живые враги в клетке (tx, ty) — без игрока и снарядов."""
+        return [entity for entity in self.entities_at(tx, ty)
+                if entity is not self.player and blocks(entity)]
+
+    def is_occupied(self, tx: int, ty: int, ignore=None) -> bool:
+        """Стоит ли в клетке (tx, ty) живой персонаж, кроме ignore."""
+        if self.swarm and self.swarm.is_occupied(tx, ty, ignore):
+            return True
+        return self.entity_group.is_occupied(tx, ty, ignore)
+
+    def entities_in_rect(self, x0: int, y0: int, x1: int, y1: int) -> list:
+        """Персонажи и снаряды в прямоугольнике клеток (x1, y1 не входят)."""
+        result = self.entity_group.in_rect(x0, y0, x1, y1)
+        if self.swarm:
+            result.extend(self.swarm.in_rect(x0, y0, x1, y1))
+        return result
+
+    def entities_in_radius(self, tx: int, ty: int, radius: int) -> list:
+        """Персонажи и снаряды не дальше radius шагов от клетки (tx, ty)."""
+        result = self.entity_group.in_radius(tx, ty, radius)
+        if self.swarm:
+            result.extend(self.swarm.in_radius(tx, ty, radius))
+        return result
+
+    def spawn(self, enemy_class, group) -> "Enemy | None":
+        """
+        Спавнит врага на случайной свободной клетке (проходимой,
+        без игрока и других врагов). Возвращает созданного врага
+        или None, если свободных клеток не осталось.
+        """
+        tile = self.free_cells.sample()
+        if tile is None:
+            return None
+        return self.spawn_at(enemy_class, group, *tile)
+
+    def spawn_wave(self, enemy_class, count: int, group=None,
+                   min_distance: int = 0, area=None) -> list:
+        """
+        Спавнит сразу count врагов на разных свободных клетках.
+
+        Ограничения:
+        - min_distance: не ближе этого числа шагов к игроку (манхэттенское расстояние)
+        - area: прямоугольник клеток (x0, y0, x1, y1), x1 и y1 не входят
+
+        Если подходящих клеток меньше, чем count, спавнит сколько есть.
+        Возвращает список созданных врагов.
+        """
+        if group is None:
+            group = self.entity_group
+
+        player_tile = None
+        if self.player and min_distance > 0:
+            player_tile = (self.player.rect.x // TILE_SIZE, self.player.rect.y // TILE_SIZE)
+
+        def allowed(tile: tuple[int, int]) -> bool:
+            tx, ty = tile
+            if area and not (area[0] <= tx < area[2] and area[1] <= ty < area[3]):
+                return False
+            if player_tile and abs(tx - player_tile[0]) + abs(ty - player_tile[1]) < min_distance:
+                return False
+            return True
+
+        # Один проход по свободным клеткам, затем случайная выборка без повторов
+        candidates = [tile for tile in self.free_cells.cells if allowed(tile)]
+        tiles = random.sample(candidates, min(count, len(candidates)))
+        return [self.spawn_at(enemy_class, group, tx, ty) for tx, ty in tiles]
+
+    def spawn_at(self, enemy_class, group, tx: int, ty: int) -> "Enemy":
+        """Создаёт врага в клетке (tx, ty) (в рое — только запись в массивах)."""
+        if self.swarm:
+            enemy = self.swarm.add(enemy_class, tx, ty)
+        else:
+            enemy = enemy_class(tx * TILE_SIZE, ty * TILE_SIZE, group)
+        self.enemies.append(enemy)
+        return enemy
+
+    def update_terrain(self) -> None:
+        """Один шаг жизни местности за ход (если TERRAIN_SIM включён)."""
+        if self.terrain:
+            self.terrain.step()
+
+    def update_enemies(self, player) -> None:
+        """
+        Ход всех врагов: через планировщик уровней ИИ, если он включён,
+        иначе рой ходит одним проходом, а спрайты — по одному.
+        """
+        if self.ai:
+            self.ai.update(player)
+            return
+        if self.swarm:
+            self.swarm.update(player, self)
+            return
+        for enemy in self.enemies:
+            enemy.update(player, self)
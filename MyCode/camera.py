@@ -1,5 +1,5 @@
 import pygame
-from constants import WIDTH, HEIGHT
+from constants import WIDTH, HEIGHT, TILE_SIZE, MAP_SIZE
 
 
 class Camera:
@@ -14,6 +14,17 @@ class Camera:
         """Сдвигает спрайт на смещение камеры."""
         return entity.rect.move(self.camera_rect.topleft)
 
+    def visible_tiles(self, margin: int = 1) -> tuple[int, int, int, int]:
+        """
+        Возвращает диапазон тайлов (x0, y0, x1, y1), попадающих в окно,
+        с запасом margin тайлов с каждой стороны. x1 и y1 не включаются.
+        """
+        x0 = max(0, -self.x // TILE_SIZE - margin)
+        y0 = max(0, -self.y // TILE_SIZE - margin)
+        x1 = min(MAP_SIZE[0], (-self.x + WIDTH) // TILE_SIZE + 1 + margin)
+        y1 = min(MAP_SIZE[1], (-self.y + HEIGHT) // TILE_SIZE + 1 + margin)
+        return x0, y0, x1, y1
+
     def update(self, target: pygame.sprite.Sprite) -> None:
         """Следит за целевым спрайтом (обычно игроком)."""
         self.x = -target.rect.centerx + WIDTH // 2
@@ -1,53 +1,50 @@
 import pygame
 from constants import *
-from pathfinding import bfs
+from pathfinding import next_step, UNREACHABLE
+from hpa import HierarchicalPath
+from occupancy import relocate, blocks
+from assets import player_atlas
 
 
 class Character(pygame.sprite.Sprite):
     """Базовый класс для персонажей (игрок, враги)."""
+    # Персонаж занимает свою клетку: другие в неё не заходят
+    solid = True
+
     def __init__(self, x: int, y: int,
                  *groups: pygame.sprite.Group) -> None:
-        super().__init__(*groups)
+        super().__init__()
         self.image_size = (TILE_SIZE, TILE_SIZE)
         self.image = pygame.Surface(self.image_size)
         self.rect = self.image.get_rect(topleft=(x, y))
+        # В группы добавляем, когда уже есть rect: по нему группа узнаёт клетку
+        self.add(*groups)
 
     def is_alive(self) -> bool:
         return getattr(self, "health", 0) > 0
 
+    @property
+    def tile(self) -> tuple[int, int]:
+        """Клетка персонажа (как у SwarmEnemy.tile)."""
+        return self.rect.x // TILE_SIZE, self.rect.y // TILE_SIZE
+
+    def move_to(self, tx: int, ty: int) -> None:
+        """Переставляет персонажа в клетку (tx, ty) и обновляет хэш клеток."""
+        self.rect.x = tx * TILE_SIZE
+        self.rect.y = ty * TILE_SIZE
+        relocate(self)
+
 
 class Player(Character):
     def __init__(self, x: int, y: int,
                  *groups: pygame.sprite.Group) -> None:
         super().__init__(x, y, *groups)
 
-        # Idle-кадры (когда стоит)
-        self.idle_frames = {
-            'down':   pygame.image.load('../Images/Player/Player_d1.png').convert_alpha(),
-            'up':     pygame.image.load('../Images/Player/Player_u1.png').convert_alpha(),
-            'left':   pygame.image.load('../Images/Player/Player_l1.png').convert_alpha(),
-            'right':  pygame.image.load('../Images/Player/Player_r1.png').convert_alpha()
-        }
-
-        # Ходьба: по 8 кадров в каждом направлении
-        self.walk_frames = {
-            'down': [
-                pygame.image.load(f'../Images/Player/Player_rd/Player_rd_0{i}.png').convert_alpha()
-                for i in range(8)
-            ],
-            'up': [
-                pygame.image.load(f'../Images/Player/Player_ru/Player_ru_0{i}.png').convert_alpha()
-                for i in range(8)
-            ],
-            'left': [
-                pygame.image.load(f'../Images/Player/Player_rl/Player_rl_0{i}.png').convert_alpha()
-                for i in range(8)
-            ],
-            'right': [
-                pygame.image.load(f'../Images/Player/Player_rr/Player_rr_0{i}.png').convert_alpha()
-                for i in range(8)
-            ],
-        }
+        # Кадры из общего атласа: idle (когда стоит) и по 8 кадров ходьбы
+        # в каждом направлении, уже размером с тайл
+        atlas = player_atlas()
+        self.idle_frames = atlas.idle
+        self.walk_frames = atlas.walk
 
         self.size = (TILE_SIZE, TILE_SIZE)
 
@@ -59,87 +56,75 @@ class Player(Character):
         self.walk_frame_delay = 1
 
         # Текущее изображение (idle)
-        self.image = pygame.transform.scale(self.idle_frames[self.direction],
-                                            self.size)
-        self.rect = self.image.get_rect(topleft=(x, y))
+        self.image = self.idle_frames[self.direction]
 
         self.health = HEALTH
         self.angle = 180  # смотрит вниз
-        self.projectiles = pygame.sprite.Group()
 
-    def update(self, event: pygame.event.Event, board, set_element: list[str], enemy=None) -> bool:
+    def update(self, event: pygame.event.Event, board, set_element: list[str]) -> bool:
         if not self.is_alive():
             self.kill()
             return False
 
         moved = False
         if event.type == pygame.KEYUP:
-            moved = self.handle_keys(event, board,
-                                     set_element, enemy)
+            moved = self.handle_keys(event, board, set_element)
 
         self.animate()
         return moved
 
-    def handle_keys(self, event, board, set_element: list[str,], enemy) -> bool:
+    def handle_keys(self, event, board, set_element: list[str,]) -> bool:
         """Обработка перемещений игрока + применение заклинаний."""
         moved = False
-        ex, ey = (-1, -1)
-        if enemy and enemy.is_alive():
-            ex, ey = (enemy.rect.x // TILE_SIZE, enemy.rect.y // TILE_SIZE)
 
         if event.key == pygame.K_w:
             nx = self.rect.x // TILE_SIZE
             ny = (self.rect.y - TILE_SIZE) // TILE_SIZE
-            if (nx, ny) != (ex, ey):
-                if 0 <= nx < MAP_SIZE[0] and 0 <= ny < MAP_SIZE[1]:
-                    if board.map_data[ny][nx] in IS_PASSABLE:
-                        self.rect.y -= TILE_SIZE
-                        self.angle = 0
-                        self.direction = 'up'
-                        self.is_moving = True
-                        moved = True
+            if not board.is_occupied(nx, ny, self):
+                if board.map_data.is_passable(nx, ny):
+                    self.rect.y -= TILE_SIZE
+                    self.angle = 0
+                    self.direction = 'up'
+                    self.is_moving = True
+                    moved = True
 
         elif event.key == pygame.K_s:
             nx = self.rect.x // TILE_SIZE
             ny = (self.rect.y + TILE_SIZE) // TILE_SIZE
-            if (nx, ny) != (ex, ey):
-                if 0 <= nx < MAP_SIZE[0] and 0 <= ny < MAP_SIZE[1]:
-                    if board.map_data[ny][nx] in IS_PASSABLE:
-                        self.rect.y += TILE_SIZE
-                        self.angle = 180
-                        self.direction = 'down'
-                        self.is_moving = True
-                        moved = True
+            if not board.is_occupied(nx, ny, self):
+                if board.map_data.is_passable(nx, ny):
+                    self.rect.y += TILE_SIZE
+                    self.angle = 180
+                    self.direction = 'down'
+                    self.is_moving = True
+                    moved = True
 
         elif event.key == pygame.K_a:
             nx = (self.rect.x - TILE_SIZE) // TILE_SIZE
             ny = self.rect.y // TILE_SIZE
-            if (nx, ny) != (ex, ey):
-                if 0 <= nx < MAP_SIZE[0] and 0 <= ny < MAP_SIZE[1]:
-                    if board.map_data[ny][nx] in IS_PASSABLE:
-                        self.rect.x -= TILE_SIZE
-                        self.angle = 90
-                        self.direction = 'left'
-                        self.is_moving = True
-                        moved = True
+            if not board.is_occupied(nx, ny, self):
+                if board.map_data.is_passable(nx, ny):
+                    self.rect.x -= TILE_SIZE
+                    self.angle = 90
+                    self.direction = 'left'
+                    self.is_moving = True
+                    moved = True
 
         elif event.key == pygame.K_d:
             nx = (self.rect.x + TILE_SIZE) // TILE_SIZE
             ny = self.rect.y // TILE_SIZE
-            if (nx, ny) != (ex, ey):
-                if 0 <= nx < MAP_SIZE[0] and 0 <= ny < MAP_SIZE[1]:
-                    if board.map_data[ny][nx] in IS_PASSABLE:
-                        self.rect.x += TILE_SIZE
-                        self.angle = 270
-                        self.direction = 'right'
-                        self.is_moving = True
-                        moved = True
+            if not board.is_occupied(nx, ny, self):
+                if board.map_data.is_passable(nx, ny):
+                    self.rect.x += TILE_SIZE
+                    self.angle = 270
+                    self.direction = 'right'
+                    self.is_moving = True
+                    moved = True
 
         elif event.key == pygame.K_SPACE:
             # Применение стихий
-            elements = board.spell_class(set_element, self.angle, self.rect.x, self.rect.y,
-                                         board, self, enemy)
-            elements.set_elements()
+            board.spells.cast(set_element, self.angle, self.rect.x, self.rect.y,
+                              board, self)
             moved = True
 
         elif event.key == pygame.K_q:
@@ -152,8 +137,9 @@ class Player(Character):
             self.angle = (self.angle + 270) % 360
             self.update_direction_by_angle()
 
-        # Если игрок двигался, проверяем, не встал ли он на магму
+        # Если игрок двигался, обновляем его клетку и проверяем, не встал ли он на магму
         if moved:
+            relocate(self)
             self.check_magma_damage(board)
 
         return moved
@@ -171,11 +157,10 @@ class Player(Character):
     def check_magma_damage(self, board) -> None:
         tx = self.rect.x // TILE_SIZE
         ty = self.rect.y // TILE_SIZE
-        if 0 <= tx < MAP_SIZE[0] and 0 <= ty < MAP_SIZE[1]:
-            if board.map_data[ty][tx] == 7:  # код магмы
-                if self.is_alive():
-                    self.health -= 5
-                    print(f"Player Health: {self.health}")
+        if board.map_data.at(tx, ty) == 7:  # код магмы
+            if self.is_alive():
+                self.health -= 5
+                print(f"Player Health: {self.health}")
 
     def animate(self) -> None:
         if self.is_moving:
@@ -184,8 +169,7 @@ class Player(Character):
                 self.walk_frame_timer = 0
                 self.walk_frame_index = (self.walk_frame_index + 1) % len(self.walk_frames[self.direction])
 
-            cur_frame = self.walk_frames[self.direction][self.walk_frame_index]
-            self.image = pygame.transform.scale(cur_frame, self.size)
+            self.image = self.walk_frames[self.direction][self.walk_frame_index]
 
             # Прекращаем анимацию после полной "прокрутки"
             if self.walk_frame_index == 7:
@@ -193,11 +177,7 @@ class Player(Character):
                 self.walk_frame_index = 0
         else:
             # Idle
-            idle_surface = self.idle_frames[self.direction]
-            self.image = pygame.transform.scale(idle_surface, self.size)
-
-        center = self.rect.center
-        self.rect = self.image.get_rect(center=center)
+            self.image = self.idle_frames[self.direction]
 
 
 class Enemy(Character):
@@ -208,6 +188,13 @@ class Enemy(Character):
         self.health = 50
         self.damage = 10
 
+        # Последний найденный путь в обход других врагов и версия карты, для которой он найден.
+        # У дальнего пути HPA* path — уже уточнённые клетки, а waypoints — остальные
+        # точки абстрактного пути до цели (уточняются по мере ходьбы)
+        self.path = None
+        self.waypoints = []
+        self.path_version = -1
+
     def update(self, player, board) -> None:
         if not self.is_alive():
             self.kill()
@@ -216,27 +203,26 @@ class Enemy(Character):
         ex, ey = (self.rect.x // TILE_SIZE, self.rect.y // TILE_SIZE)
         px, py = (player.rect.x // TILE_SIZE, player.rect.y // TILE_SIZE)
 
-        # Собираем заблокированные клетки
-        # 1) Клетка, где стоит игрок (чтобы не сливаться с ним)
+        # Заблокированные клетки — где стоят игрок и ДРУГИЕ враги.
+        # Берём только соседей рядом: дальние к нашему приходу уже уйдут,
+        # а путь с меньшим набором чаще есть в кэше.
         blocked = set()
-        if (ex, ey) != (px, py):
-            blocked.add((px, py))
-
-        # 2) Клетки, где стоят ДРУГИЕ враги (кроме нас самих)
-        for other_enemy in board.enemies:
-            if other_enemy is not self and other_enemy.is_alive():
-                ox = other_enemy.rect.x // TILE_SIZE
-                oy = other_enemy.rect.y // TILE_SIZE
-                # Если это не мы сами
-                if (ox, oy) != (ex, ey):
-                    blocked.add((ox, oy))
-
-        path = bfs((ex, ey), (px, py), board.map_data, blocked)
-        if path and len(path) > 1:
-            nx, ny = path[1]
-            if (nx, ny) != (px, py):
-                self.rect.x = nx * TILE_SIZE
-                self.rect.y = ny * TILE_SIZE
+        for other in board.entities_in_radius(ex, ey, DETOUR_RADIUS):
+            if other is not self and blocks(other):
+                blocked.add(other.tile)
+        blocked.discard((ex, ey))
+
+        if board.planner and abs(ex - px) + abs(ey - py) >= HPA_MIN_DISTANCE:
+            # Далёкий враг на большой карте идёт по иерархическому пути,
+            # доигрывая его хвост, пока игрок смещается на клетку за ход
+            step = self.follow_path((ex, ey), (px, py), board, set())
+            if step in blocked:
+                step = None
+        else:
+            # Шагаем по общему полю расстояний до игрока в самую близкую к нему клетку
+            step = self.step_by_field((ex, ey), (px, py), board, blocked)
+        if step:
+            self.move_to(*step)
 
         # Если вплотную, атакуем
         if abs(ex - px) + abs(ey - py) == 1:
@@ -244,14 +230,116 @@ class Enemy(Character):
 
         self.check_magma_damage(board)
 
+    def coarse_update(self, player, board, steps: int) -> None:
+        """
+        Грубый ход для врагов на средней дистанции (см. AIScheduler):
+        до steps шагов по полю расстояний сразу, без обходов и атаки.
+        """
+        if not self.is_alive():
+            self.kill()
+            return
+
+        ex, ey = (self.rect.x // TILE_SIZE, self.rect.y // TILE_SIZE)
+        px, py = (player.rect.x // TILE_SIZE, player.rect.y // TILE_SIZE)
+        blocked = {other.tile for other in board.entities_in_radius(ex, ey, steps)
+                   if other is not self and blocks(other)}
+
+        field = board.get_distance_field((px, py))
+        x, y = ex, ey
+        for _ in range(steps):
+            step = next_step(field, board.map_data, x, y, blocked)
+            if step is None:
+                break
+            x, y = step
+        if (x, y) != (ex, ey):
+            self.move_to(x, y)
+
+        self.check_magma_damage(board)
+
+    def step_by_field(self, start: tuple[int, int], goal: tuple[int, int],
+                      board, blocked: set) -> tuple[int, int] | None:
+        """Следующая клетка к goal по общему полю расстояний Board."""
+        ex, ey = start
+        field = board.get_distance_field(goal)
+        step = next_step(field, board.map_data, ex, ey, blocked)
+        if step is None and field[ey * board.map_data.width + ex] not in (UNREACHABLE, 0, 1):
+            # Короткий путь загорожен другими врагами — ищем обход
+            step = self.follow_path(start, goal, board, blocked)
+        return step
+
+    def follow_path(self, start: tuple[int, int], goal: tuple[int, int],
+                    board, blocked: set) -> tuple[int, int] | None:
+        """
+        Следующая клетка пути от start до goal в обход blocked.
+        Если враг всё ещё на своём прошлом пути, а цель сдвинулась
+        не больше чем на клетку, доигрываем хвост прошлого пути,
+        иначе берём путь из кэша путей Board.
+        """
+        path = self.reuse_path(start, goal, board)
+        if path is None or (len(path) > 1 and path[1] in blocked):
+            path = board.find_path(start, goal, blocked)
+            self.waypoints = []
+            if isinstance(path, HierarchicalPath):
+                # Копии: путь из кэша могут взять и другие враги
+                path, self.waypoints = list(path.cells), list(path.waypoints)
+        if path and len(path) < 2 and self.waypoints:
+            # Уточнённые клетки кончились — уточняем следующий отрезок
+            segment = board.planner.refine(path[-1], self.waypoints[0])
+            if segment is None:
+                path = None
+            else:
+                path = path + segment[1:]
+                self.waypoints = self.waypoints[1:]
+        self.path = path
+        self.path_version = board.terrain_version
+
+        if path and len(path) > 1 and path[1] != goal and path[1] not in blocked:
+            return path[1]
+        return None
+
+    def reuse_path(self, start: tuple[int, int], goal: tuple[int, int],
+                   board) -> list[tuple[int, int]] | None:
+        """Хвост прошлого пути от start, продлённый до goal, или None."""
+        if not self.path or self.path_version != board.terrain_version:
+            return None
+        if start not in self.path:
+            return None
+
+        tail = self.path[self.path.index(start):]
+        if self.waypoints:
+            # Неуточнённый хвост пути HPA*: цель сдвигаем в его точках
+            old_goal = self.waypoints[-1]
+            if goal != old_goal:
+                if abs(goal[0] - old_goal[0]) + abs(goal[1] - old_goal[1]) != 1:
+                    return None
+                before = self.waypoints[-2] if len(self.waypoints) > 1 else tail[-1]
+                if before == goal:
+                    self.waypoints = self.waypoints[:-1]
+                else:
+                    self.waypoints = self.waypoints + [goal]
+            board.path_cache.reused += 1
+            return tail
+
+        old_goal = tail[-1]
+        if goal != old_goal:
+            if abs(goal[0] - old_goal[0]) + abs(goal[1] - old_goal[1]) != 1:
+                return None
+            if len(tail) > 1 and tail[-2] == goal:
+                # Цель шагнула назад по пути
+                tail = tail[:-1]
+            else:
+                tail = tail + [goal]
+
+        board.path_cache.reused += 1
+        return tail
+
     def check_magma_damage(self, board) -> None:
         tx = self.rect.x // TILE_SIZE
         ty = self.rect.y // TILE_SIZE
-        if 0 <= tx < MAP_SIZE[0] and 0 <= ty < MAP_SIZE[1]:
-            if board.map_data[ty][tx] == 7:  # магма
-                if self.is_alive():
-                    self.health -= 5
-                    print(f"Enemy Health: {self.health}")
+        if board.map_data.at(tx, ty) == 7:  # магма
+            if self.is_alive():
+                self.health -= 5
+                print(f"Enemy Health: {self.health}")
 
     def attack(self, player) -> None:
         if player.is_alive():
@@ -264,10 +352,8 @@ class Enemy(Character):
         ey = self.rect.y // TILE_SIZE
         new_x = ex + dx * 3
         new_y = ey + dy * 3
-        if 0 <= new_x < MAP_SIZE[0] and 0 <= new_y < MAP_SIZE[1]:
-            if board.map_data[new_y][new_x] in IS_PASSABLE:
-                self.rect.x = new_x * TILE_SIZE
-                self.rect.y = new_y * TILE_SIZE
+        if board.map_data.is_passable(new_x, new_y) and not board.is_occupied(new_x, new_y, self):
+            self.move_to(new_x, new_y)
 
 
 class WeakEnemy(Enemy):
@@ -0,0 +1,216 @@
+from collections import deque
+
+
+# Метка непроходимой клетки
+NO_COMPONENT = -1
+
+
+class ConnectivityLabels:
+    """
+    Метки связных областей проходимых клеток карты (TileGrid).
+
+    Каждая проходимая клетка хранит номер метки, а метки объединяются
+    системой непересекающихся множеств (union-find): две клетки в одной
+    области, если у их меток общий корень. Так поиск пути узнаёт, что
+    цель недостижима, без обхода всей области.
+
+    update(x, y) вызывается, когда клетка поменяла проходимость
+    (update_many — когда несколько клеток поменяли её за раз):
+    - клетка стала проходимой — метки соседей объединяются (union);
+    - клетка стала непроходимой — область могла распасться, и соседи
+      обходятся одновременно, пока их обходы не встретятся. Новые метки
+      получают только отрезанные части, большая часть области не трогается.
+    """
+    def __init__(self, map_data) -> None:
+        self.map_data = map_data
+        self.labels = [NO_COMPONENT] * (map_data.width * map_data.height)
+        # parent[метка] — родитель метки в union-find
+        self.parent = []
+        self.build()
+
+    def build(self) -> None:
+        """Размечает всю карту заново (обход в ширину от каждой неразмеченной клетки)."""
+        passable = self.map_data.passable
+        labels = self.labels
+        for i in range(len(labels)):
+            labels[i] = NO_COMPONENT
+        self.parent = []
+
+        for i in range(len(labels)):
+            if passable[i] and labels[i] == NO_COMPONENT:
+                label = self.new_label()
+                labels[i] = label
+                queue = deque([i])
+                while queue:
+                    cur = queue.popleft()
+                    for ni in self.neighbours(cur):
+                        if passable[ni] and labels[ni] == NO_COMPONENT:
+                            labels[ni] = label
+                            queue.append(ni)
+
+    def new_label(self) -> int:
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def find(self, label: int) -> int:
+        """Корень метки (со сжатием путей)."""
+        parent = self.parent
+        root = label
+        while parent[root] != root:
+            root = parent[root]
+        while parent[label] != root:
+            parent[label], label = root, parent[label]
+        return root
+
+    def neighbours(self, i: int) -> list[int]:
+        """Соседи клетки i по 4 сторонам в пределах карты."""
+        width = self.map_data.width
+        x = i % width
+        result = []
+        if x > 0:
+            result.append(i - 1)
+        if x < width - 1:
+            result.append(i + 1)
+        if i >= width:
+            result.append(i - width)
+        if i + width < len(self.labels):
+            result.append(i + width)
+        return result
+
+    # ---- запросы ----
+
+    def component(self, x: int, y: int) -> int:
+        """Номер области клетки (x, y); NO_COMPONENT, если она непроходима или вне карты."""
+        if not self.map_data.in_bounds(x, y):
+            return NO_COMPONENT
+        label = self.labels[y * self.map_data.width + x]
+        if label == NO_COMPONENT:
+            return NO_COMPONENT
+        return self.find(label)
+
+    def touching(self, x: int, y: int) -> set[int]:
+        """
+        Области, из которых можно шагнуть в клетку (x, y): её собственная,
+        а для непроходимой клетки — области проходимых соседей.
+        """
+        own = self.component(x, y)
+        if own != NO_COMPONENT:
+            return {own}
+        result = set()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            label = self.component(nx, ny)
+            if label != NO_COMPONENT:
+                result.add(label)
+        return result
+
+    def connected(self, start: tuple[int, int], goal: tuple[int, int]) -> bool:
+        """
+        Может ли вообще существовать путь от start до goal.
+        Как и в bfs, сами start и goal могут быть непроходимыми.
+        """
+        if start == goal:
+            return True
+        if not self.map_data.in_bounds(*goal):
+            return False
+        return not self.touching(*start).isdisjoint(self.touching(*goal))
+
+    # ---- обновление ----
+
+    def update(self, x: int, y: int) -> None:
+        """Клетка (x, y) поменяла проходимость: обновляем метки вокруг неё."""
+        self.update_many(((x, y),))
+
+    def update_many(self, tiles) -> None:
+        """
+        Клетки tiles поменяли проходимость, и все они уже записаны в карту
+        (Board.batch). Сначала ставшие проходимыми сливаются с соседями,
+        потом один общий split от соседей всех ставших непроходимыми:
+        по одной клетке соседние перекрытые клетки разрез бы пропустили.
+        """
+        width = self.map_data.width
+        passable = self.map_data.passable
+        labels = self.labels
+        blocked = []
+        for x, y in tiles:
+            i = y * width + x
+            if passable[i]:
+                if labels[i] == NO_COMPONENT:
+                    self.join(i)
+            elif labels[i] != NO_COMPONENT:
+                labels[i] = NO_COMPONENT
+                blocked.append(i)
+        if blocked:
+            self.split(blocked)
+
+    def join(self, i: int) -> None:
+        """Клетка i стала проходимой: сливаем её с областями соседей."""
+        passable = self.map_data.passable
+        label = self.new_label()
+        self.labels[i] = label
+        for ni in self.neighbours(i):
+            # Неразмеченный сосед тоже открылся в этом batch — он сольётся сам
+            if passable[ni] and self.labels[ni] != NO_COMPONENT:
+                root = self.find(self.labels[ni])
+                if root != label:
+                    self.parent[root] = label
+
+    def split(self, blocked: list[int]) -> None:
+        """
+        Клетки blocked стали непроходимыми. Одновременно обходим область от каждого
+        их проходимого соседа; встретившиеся обходы сливаются. Обход, которому
+        некуда идти дальше, — отрезанная часть, она получает новую метку.
+        Останавливаемся, когда остался один обход: он сохраняет старую метку.
+        Каждая отрезанная часть касается blocked, так что один сосед — один кусок.
+        """
+        passable = self.map_data.passable
+        labels = self.labels
+        starts = list(dict.fromkeys(ni for i in blocked for ni in self.neighbours(i) if passable[ni]))
+        if len(starts) < 2:
+            return
+
+        owner = {}
+        groups = list(range(len(starts)))
+        queues = []
+        cells = []
+        for group, start in enumerate(starts):
+            owner[start] = group
+            queues.append(deque([start]))
+            cells.append([start])
+
+        def find_group(group: int) -> int:
+            while groups[group] != group:
+                group = groups[group]
+            return group
+
+        active = set(groups)
+        while len(active) > 1:
+            for group in list(active):
+                if group not in active:
+                    continue
+                queue = queues[group]
+                if not queue:
+                    # Отрезанная часть: размечаем её заново
+                    label = self.new_label()
+                    for cell in cells[group]:
+                        labels[cell] = label
+                    active.discard(group)
+                    continue
+                cur = queue.popleft()
+                for ni in self.neighbours(cur):
+                    if not passable[ni]:
+                        continue
+                    other = owner.get(ni)
+                    if other is None:
+                        owner[ni] = group
+                        cells[group].append(ni)
+                        queue.append(ni)
+                        continue
+                    other = find_group(other)
+                    if other != group:
+                        # Обходы встретились — это одна часть
+                        groups[other] = group
+                        queue.extend(queues[other])
+                        cells[group].extend(cells[other])
+                        queues[other] = None
+                        cells[other] = None
+                        active.discard(other)
@@ -37,6 +37,16 @@ MAPS = ['../Maps/name_tmx/map1.tmx',
 
 MAP = random.choice(MAPS)
 
+# Папка с картами и папка для их скомпилированного кэша (см. map_cache.py)
+MAPS_DIR = '../Maps/name_tmx'
+MAP_CACHE_DIR = '../Maps/cache'
+
+# Папки с картинками для общего атласа (assets.py) и размеры его страниц
+IMAGES_DIR = '../Images'
+TILESETS_DIR = '../Maps/tiles_set'
+ATLAS_WIDTH = 2048
+ATLAS_MAX_HEIGHT = 2048
+
 if '1' in MAP or '3' in MAP:
     MAP_SIZE = (30, 25)
 elif '4' in MAP or '5' in MAP:
@@ -47,5 +57,40 @@ else:
 MAP_WIDTH = MAP_SIZE[0] * TILE_SIZE
 MAP_HEIGHT = MAP_SIZE[1] * TILE_SIZE
 
+# Направление взгляда игрока или полёта снаряда (угол) -> шаг на одну клетку
+DIRECTIONS = {0: (0, -1), 90: (-1, 0), 180: (0, 1), 270: (1, 0)}
+
+# Размер чанка заранее отрисованной карты (в тайлах)
+CHUNK_SIZE = 16
+
+# Запас буфера отрисовки (renderer.py) вокруг окна с каждой стороны (в тайлах)
+BACKBUFFER_MARGIN = 1
+
+# Сколько найденных путей хранит кэш путей Board
+PATH_CACHE_SIZE = 256
+# В каком радиусе (в тайлах) враг обходит других врагов, если они загородили путь
+DETOUR_RADIUS = 2
+
+# Иерархический поиск пути (hpa.py): размер кластера в тайлах,
+# с какого размера карты он включается и для каких дальних запросов используется
+HPA_CLUSTER_SIZE = 16
+HPA_MIN_MAP_SIZE = 100
+HPA_MIN_DISTANCE = 32
+
+# Хранить врагов массивами в EnemySwarm (swarm.py) вместо спрайта на каждого —
+# для тысяч врагов одновременно
+ENEMY_SWARM = False
+
+# Уровни детализации ИИ (ai.py): ближние враги (в шагах пути) ходят каждый ход,
+# средние — раз в AI_MID_PERIOD ходов, дальние (дальше AI_MID_DISTANCE шагов) спят
+AI_LOD = True
+AI_NEAR_DISTANCE = 10
+AI_MID_DISTANCE = 30
+AI_MID_PERIOD = 3
+
+# Раз в ход местность живёт сама (terrain_sim.py): огонь, остывание магмы, высыхание.
+# Выключено по умолчанию: меняет обычную игру (карта загорается уже при загрузке)
+TERRAIN_SIM = False
+
 # Какие коды считаются проходимыми
 IS_PASSABLE = [0, 1, 2, 7]
\ No newline at end of file
@@ -0,0 +1,67 @@
+from constants import IS_PASSABLE
+
+
+# Таблица проходимости для всех 256 кодов: 1 — проходимо, 0 — нет
+PASSABLE_TABLE = bytes(1 if code in IS_PASSABLE else 0 for code in range(256))
+
+
+class TileGrid:
+    """
+    Сетка кодов тайлов карты в одном непрерывном bytearray (по байту на клетку).
+
+    - cells: коды тайлов построчно, индекс клетки (x, y) — y * width + x
+    - passable: маска проходимости той же формы, пересчитывается в set()
+
+    Старый доступ grid[y][x] на чтение тоже работает (строка — memoryview
+    без копирования). Менять тайлы нужно только через set(),
+    иначе маска проходимости разойдётся с кодами.
+    """
+    def __init__(self, width: int, height: int, cells: bytes | None = None) -> None:
+        self.width = width
+        self.height = height
+        if cells is None:
+            self.cells = bytearray(width * height)
+        else:
+            self.cells = bytearray(cells)
+        self.passable = bytearray(self.cells.translate(PASSABLE_TABLE))
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> memoryview:
+        """Строка y только для чтения: grid[y][x] — код тайла."""
+        start = y * self.width
+        return memoryview(self.cells)[start:start + self.width].toreadonly()
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get(self, x: int, y: int) -> int:
+        """Код тайла без проверки границ."""
+        return self.cells[y * self.width + x]
+
+    def at(self, x: int, y: int, default=None):
+        """Код тайла или default, если (x, y) вне карты."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.cells[y * self.width + x]
+        return default
+
+    def set(self, x: int, y: int, code: int) -> None:
+        """Записывает код тайла и обновляет маску проходимости."""
+        i = y * self.width + x
+        self.cells[i] = code
+        self.passable[i] = PASSABLE_TABLE[code]
+
+    def is_passable(self, x: int, y: int) -> bool:
+        """Можно ли пройти по клетке (x, y); вне карты — нельзя."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.passable[y * self.width + x] == 1
+        return False
+
+    def view(self) -> memoryview:
+        """Все коды одной плоской строкой только для чтения (без копирования)."""
+        return memoryview(self.cells).toreadonly()
+
+    def passable_view(self) -> memoryview:
+        """Маска проходимости одной плоской строкой только для чтения (без копирования)."""
+        return memoryview(self.passable).toreadonly()
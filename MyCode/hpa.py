@@ -0,0 +1,337 @@
+import heapq
+from collections import deque
+
+from constants import HPA_CLUSTER_SIZE
+from pathfinding import astar, manhattan
+
+
+# Проход между кластерами длиннее этого получает два входа (по краям), короче — один (в середине)
+WIDE_ENTRANCE = 6
+
+
+class HierarchicalPath:
+    """
+    Путь HPA*, который уточняется по клеткам лениво.
+
+    cells — уже уточнённые клетки от старта, waypoints — ещё не уточнённые
+    точки абстрактного пути (входы в кластеры, последняя — цель).
+    find_path уточняет только первый отрезок; следующий уточняет
+    refine_next, когда до него дошли.
+    """
+    def __init__(self, planner: "HierarchicalPlanner", cells: list[tuple[int, int]],
+                 waypoints: list[tuple[int, int]]) -> None:
+        self.planner = planner
+        self.cells = cells
+        self.waypoints = waypoints
+
+    def refine_next(self) -> bool:
+        """Уточняет следующий отрезок. False — отрезков больше нет или он не проходится."""
+        if not self.waypoints:
+            return False
+        segment = self.planner.refine(self.cells[-1], self.waypoints[0])
+        if segment is None:
+            return False
+        self.cells.extend(segment[1:])
+        del self.waypoints[0]
+        return True
+
+
+class HierarchicalPlanner:
+    """
+    Иерархический поиск пути (HPA*) для больших карт.
+
+    Карта (TileGrid) режется на кластеры cluster_size x cluster_size.
+    На границах соседних кластеров выбираются входы — пары проходимых
+    клеток по обе стороны границы. Внутри кластера заранее считаются
+    расстояния между его входами, и поиск идёт по этому маленькому графу,
+    а не по всем клеткам карты.
+
+    find_path находит абстрактный путь по входам (plan) и уточняет
+    в клетки (A* внутри одного кластера) только его первый отрезок —
+    остальные уточняются, когда до них дойдёт враг (HierarchicalPath).
+
+    invalidate(x, y) помечает кластер клетки, и перед следующим запросом
+    перестраиваются только его входы и расстояния (и у соседей — только
+    из-за общих границ).
+
+    Выгода только на дальних запросах по большим картам: на 100x100
+    с 30% препятствий построение ~90 мс, запрос ~0.5 мс против ~1.5 мс
+    у обычного A*; на 500x500 построение ~2.6 с, запрос ~5.5 мс против
+    ~28 мс (почти всё — поиск по абстрактному графу). Перестройка одного
+    изменённого кластера — 8-14 мс. Board строит планировщик при загрузке карты.
+    """
+    def __init__(self, map_data, cluster_size: int = HPA_CLUSTER_SIZE) -> None:
+        self.map_data = map_data
+        self.cluster_size = cluster_size
+        self.clusters_x = (map_data.width + cluster_size - 1) // cluster_size
+        self.clusters_y = (map_data.height + cluster_size - 1) // cluster_size
+
+        # Входы на границе (кластер, кластер справа/снизу): список пар клеток
+        self.borders = {}
+        # Переходы через границу: клетка -> множество клеток соседнего кластера
+        self.inter = {}
+        # Входы каждого кластера
+        self.cluster_nodes = {}
+        # Абстрактный граф: вход -> [(вход, расстояние)], и внутри кластера, и через границу
+        self.graph = {}
+        self.dirty = set()
+
+        for cluster in range(self.clusters_x * self.clusters_y):
+            for other in self.neighbours(cluster):
+                if other > cluster:
+                    self.build_border(cluster, other)
+        for cluster in range(self.clusters_x * self.clusters_y):
+            self.build_intra(cluster)
+
+    # ---- кластеры ----
+
+    def cluster_of(self, x: int, y: int) -> int:
+        return (y // self.cluster_size) * self.clusters_x + x // self.cluster_size
+
+    def cluster_bounds(self, cluster: int) -> tuple[int, int, int, int]:
+        """Прямоугольник кластера (x0, y0, x1, y1), x1 и y1 не входят."""
+        x0 = (cluster % self.clusters_x) * self.cluster_size
+        y0 = (cluster // self.clusters_x) * self.cluster_size
+        return (x0, y0,
+                min(x0 + self.cluster_size, self.map_data.width),
+                min(y0 + self.cluster_size, self.map_data.height))
+
+    def neighbours(self, cluster: int) -> list[int]:
+        cx = cluster % self.clusters_x
+        cy = cluster // self.clusters_x
+        result = []
+        if cx > 0:
+            result.append(cluster - 1)
+        if cx < self.clusters_x - 1:
+            result.append(cluster + 1)
+        if cy > 0:
+            result.append(cluster - self.clusters_x)
+        if cy < self.clusters_y - 1:
+            result.append(cluster + self.clusters_x)
+        return result
+
+    def nodes_of(self, cluster: int) -> set[int]:
+        """Все входы кластера (индексы клеток y * width + x)."""
+        nodes = set()
+        for other in self.neighbours(cluster):
+            key = (min(cluster, other), max(cluster, other))
+            for a, b in self.borders.get(key, ()):
+                nodes.add(a if key[0] == cluster else b)
+        return nodes
+
+    # ---- построение ----
+
+    def build_border(self, cluster: int, other: int) -> None:
+        """Находит входы на границе cluster с other (other справа или снизу)."""
+        width = self.map_data.width
+        passable = self.map_data.passable
+        x0, y0, x1, y1 = self.cluster_bounds(cluster)
+
+        if other // self.clusters_x == cluster // self.clusters_x:
+            # Граница справа: клетки (x1 - 1, y) и (x1, y)
+            cells = [(y * width + x1 - 1, y * width + x1) for y in range(y0, y1)]
+        else:
+            # Граница снизу: клетки (x, y1 - 1) и (x, y1)
+            cells = [((y1 - 1) * width + x, y1 * width + x) for x in range(x0, x1)]
+
+        pairs = []
+        run = []
+        for a, b in cells + [(None, None)]:
+            if a is not None and passable[a] and passable[b]:
+                run.append((a, b))
+                continue
+            if run:
+                if len(run) < WIDE_ENTRANCE:
+                    pairs.append(run[len(run) // 2])
+                else:
+                    pairs.append(run[0])
+                    pairs.append(run[-1])
+                run = []
+
+        for a, b in pairs:
+            self.inter.setdefault(a, set()).add(b)
+            self.inter.setdefault(b, set()).add(a)
+        self.borders[(cluster, other)] = pairs
+
+    def drop_border(self, cluster: int, other: int) -> None:
+        key = (min(cluster, other), max(cluster, other))
+        for a, b in self.borders.pop(key, ()):
+            for node, partner in ((a, b), (b, a)):
+                partners = self.inter.get(node)
+                if partners is not None:
+                    partners.discard(partner)
+                    if not partners:
+                        del self.inter[node]
+
+    def build_intra(self, cluster: int) -> None:
+        """Рёбра абстрактного графа от входов кластера (BFS внутри кластера)."""
+        for node in self.cluster_nodes.get(cluster, ()):
+            self.graph.pop(node, None)
+
+        nodes = self.nodes_of(cluster)
+        bounds = self.cluster_bounds(cluster)
+        self.cluster_nodes[cluster] = nodes
+        for node in nodes:
+            edges = list(self.cluster_distances(node, bounds, nodes).items())
+            edges.extend((other, 1) for other in self.inter.get(node, ()))
+            self.graph[node] = edges
+
+    def cluster_distances(self, origin: int, bounds: tuple[int, int, int, int],
+                          targets: set[int]) -> dict[int, int]:
+        """BFS от клетки origin в пределах bounds; расстояния до клеток targets."""
+        width = self.map_data.width
+        passable = self.map_data.passable
+        x0, y0, x1, y1 = bounds
+
+        result = {}
+        remaining = len(targets) - (origin in targets)
+        dist = {origin: 0}
+        queue = deque([origin])
+        # Останавливаемся, как только нашли все targets
+        while queue and remaining:
+            cur = queue.popleft()
+            next_dist = dist[cur] + 1
+            cx = cur % width
+            cy = cur // width
+            for ni, inside in ((cur - 1, cx > x0), (cur + 1, cx < x1 - 1),
+                               (cur - width, cy > y0), (cur + width, cy < y1 - 1)):
+                if inside and passable[ni] and ni not in dist:
+                    dist[ni] = next_dist
+                    queue.append(ni)
+                    if ni in targets:
+                        result[ni] = next_dist
+                        remaining -= 1
+        return result
+
+    def invalidate(self, x: int, y: int) -> None:
+        """Клетка (x, y) поменяла проходимость: её кластер надо перестроить."""
+        self.dirty.add(self.cluster_of(x, y))
+
+    def rebuild_dirty(self) -> None:
+        """Перестраивает входы и расстояния только у изменённых кластеров."""
+        if not self.dirty:
+            return
+        touched = set()
+        for cluster in self.dirty:
+            for other in self.neighbours(cluster):
+                self.drop_border(cluster, other)
+                low, high = min(cluster, other), max(cluster, other)
+                self.build_border(low, high)
+                touched.add(other)
+            touched.add(cluster)
+        for cluster in touched:
+            self.build_intra(cluster)
+        self.dirty.clear()
+
+    # ---- поиск ----
+
+    def plan(self, start: tuple[int, int], goal: tuple[int, int]) -> list[tuple[int, int]] | None:
+        """
+        Абстрактный путь от start до goal: клетки старта, входов в кластеры и цели.
+        None — пути нет. Как и bfs, сама цель может быть непроходимой.
+        """
+        self.rebuild_dirty()
+        if start == goal:
+            return [start]
+
+        width = self.map_data.width
+        passable = self.map_data.passable
+        start_i = start[1] * width + start[0]
+        goal_i = goal[1] * width + goal[0]
+        start_cluster = self.cluster_of(*start)
+
+        # Через какие клетки входим в цель: сама цель, если проходима,
+        # иначе её проходимые соседи — они могут лежать и в соседнем кластере.
+        # Клетка входа -> цена шага от неё до цели
+        goal_x, goal_y = goal
+        if passable[goal_i]:
+            entries = {goal_i: 0}
+        else:
+            entries = {y * width + x: 1
+                       for x, y in ((goal_x - 1, goal_y), (goal_x + 1, goal_y),
+                                    (goal_x, goal_y - 1), (goal_x, goal_y + 1))
+                       if self.map_data.in_bounds(x, y) and passable[y * width + x]}
+
+        # Временно подключаем старт и клетки входа в цель к входам их кластеров
+        start_targets = set(self.cluster_nodes[start_cluster])
+        goal_links = {}
+        for entry in entries:
+            entry_cluster = self.cluster_of(entry % width, entry // width)
+            if entry_cluster == start_cluster:
+                start_targets.add(entry)
+            distances = self.cluster_distances(entry, self.cluster_bounds(entry_cluster),
+                                               self.cluster_nodes[entry_cluster])
+            for node, cost in distances.items():
+                goal_links.setdefault(node, []).append((entry, cost))
+        start_edges = self.cluster_distances(start_i, self.cluster_bounds(start_cluster),
+                                             start_targets)
+
+        graph = self.graph
+        # В куче (f, -g, вход): при равном f раньше раскрываем более глубокий вход
+        open_heap = [(manhattan(start[0], start[1], goal_x, goal_y), 0, start_i)]
+        g_cost = {start_i: 0}
+        parents = {start_i: -1}
+        closed = set()
+
+        while open_heap:
+            _, neg_g, cur = heapq.heappop(open_heap)
+            if cur == goal_i:
+                waypoints = []
+                while cur != -1:
+                    waypoints.append((cur % width, cur // width))
+                    cur = parents[cur]
+                waypoints.reverse()
+                return waypoints
+            if cur in closed:
+                continue
+            closed.add(cur)
+            g = -neg_g
+
+            edges = graph.get(cur, ())
+            if cur == start_i:
+                edges = list(start_edges.items())
+                edges.extend((node, 1) for node in self.inter.get(cur, ()))
+            if cur in goal_links or cur in entries:
+                edges = list(edges)
+                edges.extend(goal_links.get(cur, ()))
+                if cur in entries:
+                    edges.append((goal_i, entries[cur]))
+
+            for node, cost in edges:
+                new_g = g + cost
+                if new_g >= g_cost.get(node, new_g + 1):
+                    continue
+                g_cost[node] = new_g
+                parents[node] = cur
+                h = abs(node % width - goal_x) + abs(node // width - goal_y)
+                heapq.heappush(open_heap, (new_g + h, -new_g, node))
+
+        return None
+
+    def find_path(self, start: tuple[int, int],
+                  goal: tuple[int, int]) -> HierarchicalPath | None:
+        """
+        Путь от start до goal или None. Клетки уточнены только
+        до первой точки абстрактного пути (см. HierarchicalPath).
+        """
+        if start != goal and self.cluster_of(*start) == self.cluster_of(*goal):
+            # В одном кластере сначала пробуем короткий путь внутри него
+            self.rebuild_dirty()
+            local = astar(start, goal, self.map_data,
+                          bounds=self.cluster_bounds(self.cluster_of(*start)))
+            if local is not None:
+                return HierarchicalPath(self, local, [])
+
+        waypoints = self.plan(start, goal)
+        if waypoints is None:
+            return None
+        path = HierarchicalPath(self, waypoints[:1], waypoints[1:])
+        if path.waypoints and not path.refine_next():
+            return None
+        return path
+
+    def refine(self, a: tuple[int, int], b: tuple[int, int]) -> list[tuple[int, int]] | None:
+        """Клетки отрезка абстрактного пути от a до b."""
+        if manhattan(a[0], a[1], b[0], b[1]) == 1:
+            return [a, b]
+        return astar(a, b, self.map_data, bounds=self.cluster_bounds(self.cluster_of(*a)))
@@ -5,6 +5,8 @@ from camera import Camera
 from board import Board
 from characters import Player, WeakEnemy, StrongEnemy
 from screens import show_start_screen, show_loss_screen
+from scheduler import RedrawScheduler, REDRAW_EVENTS
+from renderer import DirtyRenderer
 
 
 def main() -> None:
@@ -25,18 +27,25 @@ def main() -> None:
     board.spawn(StrongEnemy, board.entity_group)
 
     player = board.player
-    enemies = board.enemies
 
-    clock = pygame.time.Clock()
+    scheduler = RedrawScheduler()
+    renderer = DirtyRenderer(screen, board, camera)
     set_element = []  # тут будут накапливаться нажатия клавиш f,g,h,j
     running = True
 
     while running:
-        for event in pygame.event.get():
+        # Пока игрок стоит, цикл спит до следующего события
+        scheduler.animating = player.is_moving
+        for event in scheduler.wait_events():
             if event.type == pygame.QUIT:
                 running = False
 
+            if event.type in REDRAW_EVENTS:
+                renderer.invalidate()
+
             if event.type == pygame.KEYUP:
+                scheduler.mark_dirty()
+
                 # Сброс выбранных элементов
                 if event.key == pygame.K_r:
                     set_element = []
@@ -55,19 +64,22 @@ def main() -> None:
                 else:
                     # Обновление игрока (движение, заклинания и т.п.)
                     if player and player.is_alive():
-                        # Если несколько врагов, можно выбрать ближайшего
-                        # или обрабатывать всех, здесь для примера — первый
-                        enemy_for_magic = enemies[0] if enemies else None
-
-                        action_done = player.update(event, board, set_element, enemy_for_magic)
+                        # Заклинания и снаряды сами находят врагов через board
+                        action_done = player.update(event, board, set_element)
                         if action_done:
                             # Ход всех врагов
-                            for enemy in enemies:
-                                enemy.update(player, board)
+                            board.update_enemies(player)
 
                             # Обновление снарядов
-                            for proj in player.projectiles:
-                                proj.update(board, enemy_for_magic)
+                            board.projectiles.update()
+
+                            # Местность живёт: огонь, остывание магмы и т.д.
+                            board.update_terrain()
+
+        # Следующий кадр анимации ходьбы
+        if player.is_moving and scheduler.frame_due():
+            player.animate()
+            scheduler.mark_dirty()
 
         # Проверка, жив ли игрок
         if not player.is_alive():
@@ -77,11 +89,8 @@ def main() -> None:
             # Камера следует за игроком
             camera.update(player)
 
-        # Отрисовка
-        screen.fill(GREEN)
-        board.draw()
-        pygame.display.flip()
-        clock.tick(FPS)
+        # Отрисовка, только если сцена изменилась, и только изменившихся мест
+        scheduler.present(renderer.render)
 
     pygame.quit()
 
@@ -0,0 +1,245 @@
+import array
+import glob
+import hashlib
+import os
+import struct
+import sys
+
+import pygame
+import pytmx
+
+from constants import MAP_CACHE_DIR, MAPS_DIR
+
+
+# Какой код тайла даёт каждый слой TMX (по имени слоя)
+LAYER_CODES = {
+    'Ground': 0,
+    'Fire_ground': 1,
+    'Water_ground': 2,
+    'Tree': 3,
+    'Fire_tree': 4,
+    'Rock': 5,
+    'Water': 6,
+    'Magma': 7,
+}
+
+# Формат файла кэша (little-endian):
+# заголовок, пути к картинкам-атласам, таблица gid -> (атлас, прямоугольник, флаги),
+# сетка кодов тайлов (width * height байт) и сетки gid для каждого слоя (uint16).
+MAGIC = b'CMTX'
+VERSION = 1
+HEADER = struct.Struct('<4sHHHHHHd20s')
+PATH_LEN = struct.Struct('<H')
+GID_RECORD = struct.Struct('<HHHHHB')
+
+FLIP_H = 1
+FLIP_V = 2
+FLIP_D = 4
+
+
+class CompiledMap:
+    """
+    Карта, скомпилированная из TMX: всё, что нужно Board для отрисовки.
+
+    - width, height: размер карты в тайлах
+    - codes: коды тайлов построчно (width * height байт)
+    - layers: для каждого видимого слоя массив gid построчно (0 — пусто)
+    - atlases: пути к картинкам тайлсетов
+    - gids: для каждого gid (atlas, x, y, w, h, flags), для gid 0 — None
+    """
+    def __init__(self, width: int, height: int, codes: bytes, layers: list,
+                 atlases: list[str], gids: list) -> None:
+        self.width = width
+        self.height = height
+        self.codes = codes
+        self.layers = layers
+        self.atlases = atlases
+        self.gids = gids
+
+    def load_images(self, assets=None) -> list:
+        """
+        Нарезает тайлсеты карты на картинки тайлов. Возвращает список Surface, индекс — gid.
+        С assets (AssetManager) тайлсеты берутся из общего атласа,
+        без него каждый загружается с диска один раз.
+        """
+        if assets is not None:
+            atlas_surfaces = [assets.by_path(path) for path in self.atlases]
+        else:
+            atlas_surfaces = [pygame.image.load(path).convert_alpha() for path in self.atlases]
+
+        images = [None]
+        for record in self.gids[1:]:
+            atlas, x, y, w, h, flags = record
+            if not w:
+                images.append(None)
+                continue
+            image = atlas_surfaces[atlas].subsurface((x, y, w, h))
+            if flags & FLIP_D:
+                image = pygame.transform.flip(pygame.transform.rotate(image, 270), True, False)
+            if flags & (FLIP_H | FLIP_V):
+                image = pygame.transform.flip(image, bool(flags & FLIP_H), bool(flags & FLIP_V))
+            images.append(image)
+        return images
+
+
+def cache_path(tmx_path: str) -> str:
+    """Путь к файлу кэша для карты tmx_path."""
+    name = os.path.splitext(os.path.basename(tmx_path))[0]
+    return os.path.join(MAP_CACHE_DIR, name + '.tmxc')
+
+
+def file_hash(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).digest()
+
+
+def compile_map(tmx_path: str) -> CompiledMap:
+    """
+    Разбирает TMX через pytmx (без загрузки картинок)
+    и сохраняет результат в кэш рядом с остальными картами.
+    """
+    tmx_data = pytmx.TiledMap(tmx_path)
+    width, height = tmx_data.width, tmx_data.height
+    tmx_dir = os.path.dirname(tmx_path)
+
+    # pytmx без загрузчика картинок хранит для gid (путь, прямоугольник, флаги)
+    atlases = []
+    gids = [None]
+    for image in tmx_data.images[1:]:
+        if image is None:
+            gids.append((0, 0, 0, 0, 0, 0))
+            continue
+        path, (x, y, w, h), tile_flags = image
+        path = os.path.relpath(path, tmx_dir)
+        if path not in atlases:
+            atlases.append(path)
+        flags = 0
+        if tile_flags.flipped_horizontally:
+            flags |= FLIP_H
+        if tile_flags.flipped_vertically:
+            flags |= FLIP_V
+        if tile_flags.flipped_diagonally:
+            flags |= FLIP_D
+        gids.append((atlases.index(path), x, y, w, h, flags))
+
+    codes = bytearray(width * height)
+    layers = []
+    for layer in tmx_data.visible_layers:
+        if not isinstance(layer, pytmx.TiledTileLayer):
+            continue
+        code = LAYER_CODES.get(layer.name, 0)
+        grid = array.array('H', bytes(2 * width * height))
+        for y, row in enumerate(layer.data):
+            for x, gid in enumerate(row):
+                if gid:
+                    grid[y * width + x] = gid
+                    codes[y * width + x] = code
+        layers.append(grid)
+
+    compiled = CompiledMap(width, height, bytes(codes), layers,
+                           [os.path.join(tmx_dir, path) for path in atlases], gids)
+    write_cache(tmx_path, compiled, atlases)
+    return compiled
+
+
+def write_cache(tmx_path: str, compiled: CompiledMap, atlases: list[str]) -> None:
+    """Записывает скомпилированную карту в файл кэша."""
+    parts = [HEADER.pack(MAGIC, VERSION, compiled.width, compiled.height,
+                         len(compiled.layers), len(compiled.gids), len(atlases),
+                         os.stat(tmx_path).st_mtime, file_hash(tmx_path))]
+    for path in atlases:
+        encoded = path.encode('utf-8')
+        parts.append(PATH_LEN.pack(len(encoded)))
+        parts.append(encoded)
+    for record in compiled.gids[1:]:
+        parts.append(GID_RECORD.pack(*record))
+    parts.append(compiled.codes)
+    for grid in compiled.layers:
+        if sys.byteorder == 'big':
+            grid = array.array('H', grid)
+            grid.byteswap()
+        parts.append(grid.tobytes())
+
+    # Пишем во временный файл и подменяем кэш целиком: если игру убьют
+    # посреди записи, останется старый кэш или никакого, но не половина
+    os.makedirs(MAP_CACHE_DIR, exist_ok=True)
+    path = cache_path(tmx_path)
+    with open(path + '.tmp', 'wb') as f:
+        f.write(b''.join(parts))
+    os.replace(path + '.tmp', path)
+
+
+def read_cache(tmx_path: str) -> CompiledMap | None:
+    """
+    Читает кэш карты одним чтением файла.
+    Возвращает None, если кэша нет, он другой версии, устарел
+    или повреждён (размер не сходится с заголовком).
+    """
+    try:
+        with open(cache_path(tmx_path), 'rb') as f:
+            data = memoryview(f.read())
+    except OSError:
+        return None
+
+    if len(data) < HEADER.size:
+        return None
+    (magic, version, width, height, layer_count, gid_count, atlas_count,
+     mtime, digest) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    # Сначала сравниваем время изменения, и только если оно другое — хэш
+    if mtime != os.stat(tmx_path).st_mtime and digest != file_hash(tmx_path):
+        return None
+
+    tmx_dir = os.path.dirname(tmx_path)
+    offset = HEADER.size
+    atlases = []
+    try:
+        for _ in range(atlas_count):
+            (length,) = PATH_LEN.unpack_from(data, offset)
+            offset += PATH_LEN.size
+            path = bytes(data[offset:offset + length]).decode('utf-8')
+            atlases.append(os.path.join(tmx_dir, path))
+            offset += length
+    except (struct.error, UnicodeDecodeError):
+        return None
+
+    size = width * height
+    expected = offset + max(gid_count - 1, 0) * GID_RECORD.size + size + 2 * size * layer_count
+    if len(data) != expected:
+        return None
+
+    gids = [None]
+    for _ in range(gid_count - 1):
+        gids.append(GID_RECORD.unpack_from(data, offset))
+        offset += GID_RECORD.size
+
+    codes = bytes(data[offset:offset + size])
+    offset += size
+
+    layers = []
+    for _ in range(layer_count):
+        grid = array.array('H')
+        grid.frombytes(data[offset:offset + 2 * size])
+        if sys.byteorder == 'big':
+            grid.byteswap()
+        layers.append(grid)
+        offset += 2 * size
+
+    return CompiledMap(width, height, codes, layers, atlases, gids)
+
+
+def load_map(tmx_path: str) -> CompiledMap:
+    """Берёт карту из кэша, а если он устарел — компилирует её заново."""
+    compiled = read_cache(tmx_path)
+    if compiled is None:
+        compiled = compile_map(tmx_path)
+    return compiled
+
+
+if __name__ == '__main__':
+    # Компиляция всех карт заранее: python map_cache.py
+    for tmx_file in sorted(glob.glob(os.path.join(MAPS_DIR, '*.tmx'))):
+        result = compile_map(tmx_file)
+        print(f"{tmx_file}: {result.width}x{result.height}, "
+              f"{len(result.layers)} layers -> {cache_path(tmx_file)}")
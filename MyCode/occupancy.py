@@ -0,0 +1,169 @@
+import random
+
+import pygame
+from constants import TILE_SIZE
+
+
+def tile_of(sprite: pygame.sprite.Sprite) -> tuple[int, int]:
+    """Клетка, в которой находится центр спрайта."""
+    return sprite.rect.centerx // TILE_SIZE, sprite.rect.centery // TILE_SIZE
+
+
+def relocate(sprite: pygame.sprite.Sprite) -> None:
+    """
+    Сообщает пространственным группам спрайта, что он сдвинулся.
+    Вызывается после каждого изменения sprite.rect.
+    """
+    for group in sprite.groups():
+        if isinstance(group, SpatialGroup):
+            group.relocate(sprite)
+
+
+def blocks(sprite: pygame.sprite.Sprite) -> bool:
+    """Занимает ли спрайт клетку: живой персонаж — да, снаряд — нет."""
+    return getattr(sprite, 'solid', False) and sprite.is_alive()
+
+
+class FreeCells:
+    """
+    Множество свободных клеток: проходимых и без персонажа.
+
+    Клетки лежат в списке, а словарь хранит позицию клетки в нём, поэтому
+    добавление, удаление (перестановкой с последней) и случайный выбор
+    работают за O(1). Board обновляет его в set_tile, а пространственные
+    группы и рой — когда персонаж занимает или освобождает клетку.
+    """
+    def __init__(self, map_data) -> None:
+        self.map_data = map_data
+        self.cells = []
+        self.index = {}
+        width = map_data.width
+        for i, flag in enumerate(map_data.passable):
+            if flag:
+                self.add((i % width, i // width))
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __contains__(self, tile: tuple[int, int]) -> bool:
+        return tile in self.index
+
+    def add(self, tile: tuple[int, int]) -> None:
+        if tile not in self.index:
+            self.index[tile] = len(self.cells)
+            self.cells.append(tile)
+
+    def discard(self, tile: tuple[int, int]) -> None:
+        pos = self.index.pop(tile, None)
+        if pos is None:
+            return
+        last = self.cells.pop()
+        if pos < len(self.cells):
+            self.cells[pos] = last
+            self.index[last] = pos
+
+    def occupy(self, tile: tuple[int, int]) -> None:
+        """В клетку встал персонаж."""
+        self.discard(tile)
+
+    def vacate(self, tile: tuple[int, int]) -> None:
+        """Персонаж ушёл из клетки: она свободна, если проходима."""
+        if self.map_data.is_passable(*tile):
+            self.add(tile)
+
+    def sample(self) -> tuple[int, int] | None:
+        """Случайная свободная клетка или None, если свободных нет."""
+        if not self.cells:
+            return None
+        return self.cells[random.randrange(len(self.cells))]
+
+
+class SpatialGroup(pygame.sprite.Group):
+    """
+    Группа спрайтов с пространственным хэшем по клеткам карты.
+
+    - cells: клетка (tx, ty) -> список спрайтов в ней
+    - tiles: спрайт -> его клетка
+
+    Спрайты попадают в хэш при добавлении в группу и пропадают из него
+    при kill()/remove(). После перемещения спрайта нужно вызвать
+    relocate(sprite), иначе хэш разойдётся с sprite.rect.
+
+    Если задан free_cells (FreeCells), клетки персонажей в нём
+    отмечаются занятыми.
+    """
+    def __init__(self, *sprites) -> None:
+        self.cells = {}
+        self.tiles = {}
+        self.free_cells = None
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None) -> None:
+        super().add_internal(sprite, layer)
+        if getattr(sprite, 'rect', None) is not None:
+            self.place(sprite, tile_of(sprite))
+
+    def remove_internal(self, sprite) -> None:
+        super().remove_internal(sprite)
+        self.unplace(sprite)
+
+    def place(self, sprite, tile: tuple[int, int]) -> None:
+        self.tiles[sprite] = tile
+        self.cells.setdefault(tile, []).append(sprite)
+        if self.free_cells is not None and getattr(sprite, 'solid', False):
+            self.free_cells.occupy(tile)
+
+    def unplace(self, sprite) -> None:
+        tile = self.tiles.pop(sprite, None)
+        if tile is None:
+            return
+        cell = self.cells[tile]
+        cell.remove(sprite)
+        if not cell:
+            del self.cells[tile]
+        if (self.free_cells is not None and getattr(sprite, 'solid', False)
+                and not any(getattr(other, 'solid', False) for other in cell)):
+            self.free_cells.vacate(tile)
+
+    def relocate(self, sprite) -> None:
+        """Переносит спрайт в хэше в его текущую клетку."""
+        tile = tile_of(sprite)
+        if self.tiles.get(sprite) != tile:
+            self.unplace(sprite)
+            self.place(sprite, tile)
+
+    # ---- запросы ----
+
+    def entities_at(self, tx: int, ty: int) -> list:
+        """Все спрайты в клетке (tx, ty)."""
+        return list(self.cells.get((tx, ty), ()))
+
+    def is_occupied(self, tx: int, ty: int, ignore=None) -> bool:
+        """Стоит ли в клетке живой персонаж (кроме ignore). Снаряды клетку не занимают."""
+        for sprite in self.cells.get((tx, ty), ()):
+            if sprite is not ignore and blocks(sprite):
+                return True
+        return False
+
+    def in_rect(self, x0: int, y0: int, x1: int, y1: int) -> list:
+        """Спрайты в прямоугольнике клеток (x0, y0, x1, y1), x1 и y1 не входят."""
+        result = []
+        if (x1 - x0) * (y1 - y0) <= len(self.cells):
+            for ty in range(y0, y1):
+                for tx in range(x0, x1):
+                    result.extend(self.cells.get((tx, ty), ()))
+        else:
+            # Прямоугольник больше, чем занятых клеток — идём по занятым
+            for (tx, ty), cell in self.cells.items():
+                if x0 <= tx < x1 and y0 <= ty < y1:
+                    result.extend(cell)
+        return result
+
+    def in_radius(self, tx: int, ty: int, radius: int) -> list:
+        """Спрайты не дальше radius шагов (манхэттенское расстояние) от клетки (tx, ty)."""
+        result = []
+        for sprite in self.in_rect(tx - radius, ty - radius, tx + radius + 1, ty + radius + 1):
+            sx, sy = self.tiles[sprite]
+            if abs(sx - tx) + abs(sy - ty) <= radius:
+                result.append(sprite)
+        return result
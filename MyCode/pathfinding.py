@@ -1,10 +1,11 @@
-from collections import deque
-from constants import IS_PASSABLE
+import heapq
+from array import array
+from collections import OrderedDict, deque
 
 
 def bfs(start: tuple[int, int], goal: tuple[int, int],
-        map_data: list[list[int]], blocked=None) -> list[tuple[int, int]] | None:
-    """Поиск пути на карте при помощи BFS."""
+        map_data, blocked=None) -> list[tuple[int, int]] | None:
+    """Поиск пути на карте (TileGrid) при помощи BFS."""
     if blocked is None:
         blocked = set()
 
@@ -15,16 +16,12 @@ def bfs(start: tuple[int, int], goal: tuple[int, int],
     visited = {start}
     parents = {start: None}
 
-    # Предполагаем, что map_data — это двумерный список [строка][столбец].
-    height = len(map_data)
-    width = len(map_data[0])
-
     while queue:
         cx, cy = queue.popleft()
 
         for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
             nx, ny = cx + dx, cy + dy
-            if 0 <= nx < width and 0 <= ny < height:
+            if map_data.in_bounds(nx, ny):
                 if (nx, ny) == goal:
                     parents[(nx, ny)] = (cx, cy)
                     path = []
@@ -35,10 +32,184 @@ def bfs(start: tuple[int, int], goal: tuple[int, int],
                     path.reverse()
                     return path
 
-                if map_data[ny][nx] in IS_PASSABLE and (nx, ny) not in blocked:
+                if map_data.is_passable(nx, ny) and (nx, ny) not in blocked:
                     if (nx, ny) not in visited:
                         visited.add((nx, ny))
                         parents[(nx, ny)] = (cx, cy)
                         queue.append((nx, ny))
 
-    return None
\ No newline at end of file
+    return None
+
+
+def manhattan(x: int, y: int, goal_x: int, goal_y: int) -> int:
+    """Манхэттенское расстояние — точная оценка для ходьбы в 4 стороны."""
+    return abs(x - goal_x) + abs(y - goal_y)
+
+
+def astar(start: tuple[int, int], goal: tuple[int, int],
+          map_data, blocked=None, heuristic=manhattan,
+          bounds=None) -> list[tuple[int, int]] | None:
+    """
+    Поиск пути на карте (TileGrid) алгоритмом A*.
+
+    Сигнатура и результат те же, что у bfs: путь от start до goal включительно
+    или None. Клетки кодируются одним числом y * width + x, открытый список —
+    двоичная куча, heuristic(x, y, goal_x, goal_y) можно подменить.
+    bounds=(x0, y0, x1, y1) ограничивает поиск прямоугольником (x1, y1 не входят).
+    """
+    if blocked is None:
+        blocked = set()
+
+    if start == goal:
+        return [start]
+
+    width = map_data.width
+    passable = map_data.passable
+    min_x, min_y, max_x, max_y = bounds or (0, 0, width, map_data.height)
+    goal_x, goal_y = goal
+    goal_i = goal_y * width + goal_x
+    start_i = start[1] * width + start[0]
+    blocked_i = {y * width + x for x, y in blocked}
+
+    start_h = heuristic(start[0], start[1], goal_x, goal_y)
+    # В куче (f, h, клетка): при равном f раньше раскрываем клетку ближе к цели
+    open_heap = [(start_h, start_h, start_i)]
+    g_cost = {start_i: 0}
+    parents = {start_i: -1}
+    closed = set()
+
+    while open_heap:
+        _, _, cur = heapq.heappop(open_heap)
+        if cur in closed:
+            continue
+        closed.add(cur)
+
+        cx = cur % width
+        cy = cur // width
+        next_g = g_cost[cur] + 1
+
+        for nx, ny in ((cx, cy + 1), (cx, cy - 1), (cx + 1, cy), (cx - 1, cy)):
+            if not (min_x <= nx < max_x and min_y <= ny < max_y):
+                continue
+            ni = ny * width + nx
+
+            if ni == goal_i:
+                path = [goal]
+                while cur != -1:
+                    path.append((cur % width, cur // width))
+                    cur = parents[cur]
+                path.reverse()
+                return path
+
+            if not passable[ni] or ni in blocked_i or ni in closed:
+                continue
+            if next_g < g_cost.get(ni, next_g + 1):
+                g_cost[ni] = next_g
+                parents[ni] = cur
+                h = heuristic(nx, ny, goal_x, goal_y)
+                heapq.heappush(open_heap, (next_g + h, h, ni))
+
+    return None
+
+
+# Значение в поле расстояний для недостижимых клеток
+UNREACHABLE = -1
+
+
+def distance_field(goal: tuple[int, int], map_data, limit=None) -> array:
+    """
+    "Карта Дейкстры": обратный BFS от goal по проходимым клеткам TileGrid.
+    Возвращает плоский массив расстояний (индекс y * width + x),
+    UNREACHABLE — туда от goal не дойти (или дальше limit шагов, если он задан).
+    """
+    width = map_data.width
+    height = map_data.height
+    passable = map_data.passable
+
+    field = array('i', [UNREACHABLE]) * (width * height)
+    goal_i = goal[1] * width + goal[0]
+    field[goal_i] = 0
+
+    queue = deque([goal_i])
+    while queue:
+        cur = queue.popleft()
+        cx = cur % width
+        cy = cur // width
+        next_dist = field[cur] + 1
+        if limit is not None and next_dist > limit:
+            break
+
+        if cx > 0 and passable[cur - 1] and field[cur - 1] == UNREACHABLE:
+            field[cur - 1] = next_dist
+            queue.append(cur - 1)
+        if cx < width - 1 and passable[cur + 1] and field[cur + 1] == UNREACHABLE:
+            field[cur + 1] = next_dist
+            queue.append(cur + 1)
+        if cy > 0 and passable[cur - width] and field[cur - width] == UNREACHABLE:
+            field[cur - width] = next_dist
+            queue.append(cur - width)
+        if cy < height - 1 and passable[cur + width] and field[cur + width] == UNREACHABLE:
+            field[cur + width] = next_dist
+            queue.append(cur + width)
+
+    return field
+
+
+def next_step(field: array, map_data, x: int, y: int,
+              blocked=None) -> tuple[int, int] | None:
+    """
+    Соседняя клетка с наименьшим расстоянием в поле field,
+    если она ближе к цели, чем (x, y). Саму цель (расстояние 0)
+    и клетки из blocked не выбираем. None — шагать некуда.
+    """
+    width = map_data.width
+    best = field[y * width + x]
+    if best == UNREACHABLE:
+        return None
+
+    step = None
+    for nx, ny in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+        if not map_data.in_bounds(nx, ny):
+            continue
+        dist = field[ny * width + nx]
+        if 0 < dist < best and (blocked is None or (nx, ny) not in blocked):
+            best = dist
+            step = (nx, ny)
+    return step
+
+
+class PathCache:
+    """
+    Ограниченный LRU-кэш найденных путей.
+    Ключ — (start, goal, версия карты, frozenset заблокированных клеток),
+    поэтому после set_tile старые пути просто перестают находиться.
+
+    hits / misses — попадания и промахи кэша, reused — сколько раз враги
+    доиграли хвост своего прошлого пути без обращения к кэшу.
+    """
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.paths = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.reused = 0
+
+    def get(self, key):
+        if key in self.paths:
+            self.paths.move_to_end(key)
+            self.hits += 1
+            return True, self.paths[key]
+        self.misses += 1
+        return False, None
+
+    def put(self, key, path) -> None:
+        self.paths[key] = path
+        self.paths.move_to_end(key)
+        if len(self.paths) > self.max_size:
+            self.paths.popitem(last=False)
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return (f"path cache: {self.hits} hits, {self.misses} misses "
+                f"({rate:.0f}%), {self.reused} reused tails, {len(self.paths)} stored")
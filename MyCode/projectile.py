@@ -1,71 +1,163 @@
 import pygame
-from field import Board
-from characters import Enemy
+from array import array
+
 from constants import *
 
 
-class Projectile(pygame.sprite.Sprite):
-    def __init__(self, x: int, y: int, angle: int, projectile_type: str,
-                 color: tuple[int, int, int] = (255, 0, 0), speed: int = 1) -> None:
-        super().__init__()
+class ProjectileType:
+    """
+    Вид снаряда.
 
-        self.size = (16, 16)
-        self.image = pygame.Surface(self.size, pygame.SRCALPHA)
+    Параметры:
+    - color: цвет круга (картинка рисуется один раз на вид)
+    - transitions: какой тайл снаряд меняет при попадании {старый код: новый}
+    - stops: коды тайлов, о которые снаряд просто гасится
+    """
+    def __init__(self, color, transitions=None, stops=()) -> None:
         self.color = color
-        self.circle_center = (8, 8)
-        self.circle_radius = 8
-
-        pygame.draw.circle(self.image, self.color,
-                           self.circle_center,
-                           self.circle_radius)
-
-        self.rect = self.image.get_rect(center=(x, y))
-        self.angle = angle
-        self.speed = speed
-        self.projectile_type = projectile_type
-
-    def update(self, board: Board, enemy: Enemy = None) -> None:
-        # Движение
-        if self.angle == 0:
-            self.rect.y -= TILE_SIZE * self.speed
-        elif self.angle == 90:
-            self.rect.x -= TILE_SIZE * self.speed
-        elif self.angle == 180:
-            self.rect.y += TILE_SIZE * self.speed
-        elif self.angle == 270:
-            self.rect.x += TILE_SIZE * self.speed
-
-        # Проверка выхода за границы
-        if not (0 <= self.rect.x < MAP_WIDTH and 0 <= self.rect.y < MAP_HEIGHT):
-            self.kill()
-            return
-
-        # Столкновение с врагом
-        if enemy and enemy.is_alive():
-            if self.rect.colliderect(enemy.rect):
-                enemy.health -= ENEMY_DAMAGE
-                print(f"Enemy Health: {enemy.health}")
-                self.kill()
-                return
-
-        # Столкновение с тайлами
-        tile_x = self.rect.centerx // TILE_SIZE
-        tile_y = self.rect.centery // TILE_SIZE
-        if 0 <= tile_x < MAP_SIZE[0] and 0 <= tile_y < MAP_SIZE[1]:
-            tile_code = board.map_data[tile_y][tile_x]
-            if self.projectile_type == "fj":
-                # фаерболл
-                if tile_code == 3:
-                    board.set_tile(tile_x, tile_y, 4)  # дерево -> сожжённое
-                    self.kill()
-                elif tile_code == 4:
-                    board.set_tile(tile_x, tile_y, 0)  # fire_tree -> ground
-                    self.kill()
-                elif tile_code == 5:
-                    self.kill()
-
-            elif self.projectile_type == "gj":
-                # кинуть кирпич
-                if tile_code == 4:
-                    board.set_tile(tile_x, tile_y, 0)  # fire_tree -> ground
-                    self.kill()
\ No newline at end of file
+        self.transitions = transitions or {}
+        self.stops = stops
+
+
+PROJECTILE_TYPES = {
+    # фаербол: дерево -> сожжённое дерево, сожжённое дерево -> земля, камень гасит
+    'fj': ProjectileType(RED, {3: 4, 4: 0}, stops=(5,)),
+    # кирпич: сожжённое дерево -> земля, камень гасит
+    'gj': ProjectileType(GREY, {4: 0}, stops=(5,)),
+}
+
+
+def traverse(x0: int, y0: int, x1: int, y1: int):
+    """
+    Клетки, через которые проходит отрезок от центра клетки (x0, y0)
+    до центра клетки (x1, y1), по порядку и без стартовой (DDA по сетке).
+    Так быстрый снаряд не перепрыгивает врагов и деревья.
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    step_x = (dx > 0) - (dx < 0)
+    step_y = (dy > 0) - (dy < 0)
+    # Сколько "времени" (доли отрезка) нужно, чтобы пройти одну клетку по оси
+    delta_x = 1 / abs(dx) if dx else float('inf')
+    delta_y = 1 / abs(dy) if dy else float('inf')
+    # От центра клетки до её границы — половина клетки
+    t_x = delta_x / 2
+    t_y = delta_y / 2
+
+    x, y = x0, y0
+    while (x, y) != (x1, y1):
+        if t_x < t_y:
+            x += step_x
+            t_x += delta_x
+        else:
+            y += step_y
+            t_y += delta_y
+        yield x, y
+
+
+class ProjectileSystem:
+    """
+    Все снаряды на карте в пуле записей (параллельные массивы).
+
+    - xs, ys: клетка снаряда, dxs, dys: шаг за клетку, speeds: клеток за ход
+    - kinds: вид снаряда (ключ PROJECTILE_TYPES), None — запись свободна
+
+    Погасший снаряд освобождает запись, и следующий launch её переиспользует.
+    Картинка рисуется один раз на вид снаряда, лежит в общем атласе
+    (AssetManager) и общая для всех снарядов.
+    """
+    def __init__(self, board) -> None:
+        self.board = board
+        self.xs = array('i')
+        self.ys = array('i')
+        self.dxs = array('i')
+        self.dys = array('i')
+        self.speeds = array('i')
+        self.kinds = []
+        self.free = []
+
+        self.images = {}
+        for name, kind in PROJECTILE_TYPES.items():
+            image = pygame.Surface((16, 16), pygame.SRCALPHA)
+            pygame.draw.circle(image, kind.color, (8, 8), 8)
+            self.images[name] = board.assets.add(f'projectile/{name}', image)
+
+    def launch(self, tx: int, ty: int, angle: int, projectile_type: str, speed: int = 1) -> int:
+        """Выпускает снаряд из клетки (tx, ty) в направлении angle. Возвращает номер записи."""
+        dx, dy = DIRECTIONS[angle]
+        if self.free:
+            slot = self.free.pop()
+            self.xs[slot], self.ys[slot] = tx, ty
+            self.dxs[slot], self.dys[slot] = dx, dy
+            self.speeds[slot] = speed
+            self.kinds[slot] = projectile_type
+        else:
+            slot = len(self.kinds)
+            self.xs.append(tx)
+            self.ys.append(ty)
+            self.dxs.append(dx)
+            self.dys.append(dy)
+            self.speeds.append(speed)
+            self.kinds.append(projectile_type)
+        return slot
+
+    def release(self, slot: int) -> None:
+        self.kinds[slot] = None
+        self.free.append(slot)
+
+    def update(self) -> None:
+        """
+        Ход всех снарядов: каждый пролетает speeds клеток, проверяя каждую
+        клетку по пути. Гаснет на краю карты, на первом враге (ранит всех
+        врагов в клетке), на тайле из transitions (меняя его) или из stops.
+        """
+        board = self.board
+        map_data = board.map_data
+        changes = []
+        for slot, name in enumerate(self.kinds):
+            if name is None:
+                continue
+            kind = PROJECTILE_TYPES[name]
+            x0, y0 = self.xs[slot], self.ys[slot]
+            speed = self.speeds[slot]
+            x1 = x0 + self.dxs[slot] * speed
+            y1 = y0 + self.dys[slot] * speed
+
+            self.xs[slot], self.ys[slot] = x1, y1
+            for tx, ty in traverse(x0, y0, x1, y1):
+                code = map_data.at(tx, ty)
+                if code is None:
+                    self.release(slot)
+                    break
+
+                enemies = board.enemies_at(tx, ty)
+                if enemies:
+                    for enemy in enemies:
+                        enemy.health -= ENEMY_DAMAGE
+                        print(f"Enemy Health: {enemy.health}")
+                    self.release(slot)
+                    break
+
+                if code in kind.transitions:
+                    changes.append((tx, ty, kind.transitions[code]))
+                    self.release(slot)
+                    break
+                if code in kind.stops:
+                    self.release(slot)
+                    break
+
+        board.set_tiles(changes)
+
+    def blit_list(self, camera) -> list[tuple[pygame.Surface, tuple[int, int]]]:
+        """Пары (картинка, позиция на экране) снарядов в окне камеры (по центру клеток)."""
+        x0, y0, x1, y1 = camera.visible_tiles(margin=0)
+        left = camera.x + (TILE_SIZE - 16) // 2
+        top = camera.y + (TILE_SIZE - 16) // 2
+        result = []
+        for slot, name in enumerate(self.kinds):
+            if name is None:
+                continue
+            tx, ty = self.xs[slot], self.ys[slot]
+            if x0 <= tx < x1 and y0 <= ty < y1:
+                result.append((self.images[name], (tx * TILE_SIZE + left, ty * TILE_SIZE + top)))
+        return result
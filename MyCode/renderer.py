@@ -0,0 +1,118 @@
+import pygame
+from constants import *
+
+
+class DirtyRenderer:
+    """
+    Отрисовка Board с обновлением экрана только в изменившихся местах.
+
+    Фон карты (без персонажей) лежит в буфере back — он больше окна
+    на BACKBUFFER_MARGIN тайлов с каждой стороны. Когда камера сдвигается,
+    буфер сдвигается Surface.scroll, и заново рисуется только открывшаяся
+    полоса по краю. Потом буфер копируется на экран, а персонажи и
+    снаряды рисуются поверх.
+
+    Если камера стоит, между кадрами запоминается, какие картинки
+    персонажей и снарядов где стояли. Грязные прямоугольники кадра:
+    - старое и новое место каждой сдвинувшейся или сменившей кадр картинки;
+    - клетки, изменённые через set_tile / set_tiles (Board.redraw_tiles).
+
+    Только они восстанавливаются из буфера, персонажи рисуются поверх
+    (с клипом), и прямоугольники уходят в pygame.display.update(rects).
+    """
+    def __init__(self, screen: pygame.Surface, board, camera) -> None:
+        self.screen = screen
+        self.board = board
+        self.camera = camera
+        # (картинка, позиция) всего, что показано на экране
+        self.shown = set()
+        self.full = True
+
+        self.margin = BACKBUFFER_MARGIN * TILE_SIZE
+        width, height = screen.get_size()
+        self.view = pygame.Rect(self.margin, self.margin, width, height)
+        self.back = pygame.Surface((width + 2 * self.margin, height + 2 * self.margin), 0, screen)
+        # Положение камеры, для которого нарисован буфер
+        self.back_pos = None
+
+    def invalidate(self) -> None:
+        """Следующий кадр нарисовать и показать целиком."""
+        self.full = True
+
+    def render(self) -> list[pygame.Rect] | None:
+        """
+        Рисует кадр. Возвращает прямоугольники экрана для
+        pygame.display.update или None, если кадр нарисован целиком.
+        """
+        board = self.board
+        camera_pos = (self.camera.x, self.camera.y)
+        full = self.full or camera_pos != self.back_pos
+        if self.back_pos is None:
+            self.back_pos = camera_pos
+            self.patch_back(self.back.get_rect())
+        elif camera_pos != self.back_pos:
+            self.scroll_back(camera_pos)
+
+        # Изменённые клетки перерисовываем в буфере
+        tile_rects = [pygame.Rect(tx * TILE_SIZE + self.camera.x, ty * TILE_SIZE + self.camera.y,
+                                  TILE_SIZE, TILE_SIZE)
+                      for tx, ty in board.redraw_tiles]
+        board.redraw_tiles.clear()
+        for rect in tile_rects:
+            self.patch_back(rect.move(self.margin, self.margin))
+
+        layers = board.entity_layers()
+        shown = {(image, pos) for layer in layers for image, pos in layer}
+
+        if full:
+            self.full = False
+            self.shown = shown
+            self.screen.blit(self.back, (0, 0), self.view)
+            for layer in layers:
+                self.screen.blits(layer, doreturn=False)
+            return None
+
+        # Что исчезло со старого места и что появилось на новом
+        rects = [pygame.Rect(pos, image.get_size()) for image, pos in self.shown ^ shown]
+        rects += tile_rects
+        self.shown = shown
+
+        screen_rect = self.screen.get_rect()
+        rects = [rect.clip(screen_rect) for rect in rects]
+        rects = [rect for rect in rects if rect]
+        for rect in rects:
+            self.screen.set_clip(rect)
+            self.screen.blit(self.back, rect, rect.move(self.margin, self.margin))
+            for layer in layers:
+                self.screen.blits([(image, pos) for image, pos in layer
+                                   if rect.colliderect(pos, image.get_size())],
+                                  doreturn=False)
+        self.screen.set_clip(None)
+        return rects
+
+    def scroll_back(self, camera_pos: tuple[int, int]) -> None:
+        """Сдвигает буфер вслед за камерой и дорисовывает открывшиеся полосы."""
+        dx = camera_pos[0] - self.back_pos[0]
+        dy = camera_pos[1] - self.back_pos[1]
+        self.back_pos = camera_pos
+        width, height = self.back.get_size()
+        if abs(dx) >= width or abs(dy) >= height:
+            self.patch_back(self.back.get_rect())
+            return
+
+        self.back.scroll(dx, dy)
+        if dx > 0:
+            self.patch_back(pygame.Rect(0, 0, dx, height))
+        elif dx < 0:
+            self.patch_back(pygame.Rect(width + dx, 0, -dx, height))
+        if dy > 0:
+            self.patch_back(pygame.Rect(0, 0, width, dy))
+        elif dy < 0:
+            self.patch_back(pygame.Rect(0, height + dy, width, -dy))
+
+    def patch_back(self, area: pygame.Rect) -> None:
+        """Заново рисует фон карты в прямоугольнике area буфера."""
+        self.back.set_clip(area)
+        self.back.fill(GREEN, area)
+        self.board.draw_tiles(self.back, area, (self.margin, self.margin))
+        self.back.set_clip(None)
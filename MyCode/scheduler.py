@@ -0,0 +1,76 @@
+import pygame
+from constants import FPS
+
+
+# События окна, после которых картинку нужно показать заново
+REDRAW_EVENTS = {
+    pygame.VIDEOEXPOSE,
+    pygame.WINDOWEXPOSED,
+    pygame.WINDOWSHOWN,
+    pygame.WINDOWRESTORED,
+    pygame.WINDOWSIZECHANGED,
+}
+
+
+class RedrawScheduler:
+    """
+    Перерисовка по требованию вместо постоянных 60 FPS.
+
+    Игра пошаговая: сцена меняется только после нажатия клавиши
+    (ход игрока, врагов, снарядов и местности) и пока играет анимация
+    ходьбы игрока. Поэтому:
+
+    - dirty: сцену нужно нарисовать заново (mark_dirty);
+    - animating: идёт анимация — события ждём не дольше кадра
+      (1000 // FPS мс), чтобы вовремя показать следующий кадр;
+    - иначе цикл спит в pygame.event.wait до следующего события
+      и почти не тратит процессор.
+    """
+    def __init__(self, fps: int = FPS) -> None:
+        self.frame_time = 1000 // fps
+        self.dirty = True
+        self.animating = False
+        self.last_frame = 0
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+
+    def wait_events(self) -> list[pygame.event.Event]:
+        """
+        Ждёт события: без анимации — сколько угодно, с анимацией —
+        до следующего кадра. Возвращает все накопившиеся события
+        (пустой список, если вышло время).
+        """
+        if self.animating:
+            timeout = self.frame_time - (pygame.time.get_ticks() - self.last_frame)
+            first = pygame.event.wait(max(timeout, 1))
+        else:
+            first = pygame.event.wait()
+
+        events = [] if first.type == pygame.NOEVENT else [first]
+        events.extend(pygame.event.get())
+        for event in events:
+            if event.type in REDRAW_EVENTS:
+                self.dirty = True
+        return events
+
+    def frame_due(self) -> bool:
+        """Прошло ли с последнего показа время кадра анимации."""
+        return pygame.time.get_ticks() - self.last_frame >= self.frame_time
+
+    def present(self, draw) -> bool:
+        """
+        Рисует сцену (draw) и показывает её, только если она изменилась.
+        draw возвращает прямоугольники для pygame.display.update
+        или None — тогда показывается весь экран.
+        """
+        if not self.dirty:
+            return False
+        rects = draw()
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+        self.dirty = False
+        self.last_frame = pygame.time.get_ticks()
+        return True
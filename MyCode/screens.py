@@ -1,5 +1,20 @@
 import pygame
 from constants import WHITE, BLACK, WIDTH, HEIGHT
+from scheduler import REDRAW_EVENTS
+
+
+def wait_for_enter() -> None:
+    """Спит в pygame.event.wait, пока не нажмут Enter (или не закроют окно)."""
+    while True:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            return
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+            return
+        if event.type in REDRAW_EVENTS:
+            # Окно перекрыли или развернули — показываем экран заново
+            pygame.display.flip()
 
 
 def show_start_screen(screen: pygame.Surface) -> None:
@@ -15,15 +30,7 @@ def show_start_screen(screen: pygame.Surface) -> None:
 
     pygame.display.flip()
 
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    waiting = False
+    wait_for_enter()
 
 
 def show_loss_screen(screen: pygame.Surface) -> None:
@@ -39,12 +46,4 @@ def show_loss_screen(screen: pygame.Surface) -> None:
 
     pygame.display.flip()
 
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_RETURN:
-                    waiting = False
\ No newline at end of file
+    wait_for_enter()
@@ -0,0 +1,251 @@
+import pygame
+from array import array
+
+from constants import *
+from characters import WeakEnemy, StrongEnemy
+from pathfinding import next_step, UNREACHABLE
+
+
+# Виды врагов: класс -> (здоровье, урон, цвет). Номер вида — индекс в KINDS.
+KINDS = [
+    (WeakEnemy, WEAK_ENEMY_HEALTH, WEAK_ENEMY_DAMAGE, WEAK_ENEMY_COLOR),
+    (StrongEnemy, STRONG_ENEMY_HEALTH, STRONG_ENEMY_DAMAGE, STRONG_ENEMY_COLOR),
+]
+KIND_OF_CLASS = {kind[0]: i for i, kind in enumerate(KINDS)}
+
+
+class SwarmEnemy:
+    """
+    Фасад одного врага из EnemySwarm с тем же API, что у Enemy:
+    rect, tile, health, damage, is_alive(), update(), attack(), push_back() и т.д.
+    Своих Surface и Rect у него нет — всё лежит в массивах роя.
+    rect собирается заново при каждом обращении, поэтому частые
+    проверки (ИИ, обходы) берут клетку из tile.
+    """
+    solid = True
+
+    def __init__(self, swarm: "EnemySwarm", slot: int) -> None:
+        self.swarm = swarm
+        self.slot = slot
+
+    @property
+    def rect(self) -> pygame.Rect:
+        return pygame.Rect(self.swarm.xs[self.slot] * TILE_SIZE,
+                           self.swarm.ys[self.slot] * TILE_SIZE,
+                           TILE_SIZE, TILE_SIZE)
+
+    @property
+    def tile(self) -> tuple[int, int]:
+        """Клетка врага прямо из массивов роя, без Rect."""
+        return self.swarm.xs[self.slot], self.swarm.ys[self.slot]
+
+    @property
+    def health(self) -> int:
+        return self.swarm.health[self.slot]
+
+    @health.setter
+    def health(self, value: int) -> None:
+        self.swarm.set_health(self.slot, value)
+
+    @property
+    def damage(self) -> int:
+        return self.swarm.damage[self.slot]
+
+    @damage.setter
+    def damage(self, value: int) -> None:
+        self.swarm.damage[self.slot] = value
+
+    def is_alive(self) -> bool:
+        return self.swarm.health[self.slot] > 0
+
+    def kill(self) -> None:
+        self.swarm.set_health(self.slot, 0)
+
+    def update(self, player, board) -> None:
+        """Ход только этого врага (обычно рой ходит весь сразу, см. EnemySwarm.update)."""
+        self.swarm.update(player, board, [self.slot])
+
+    def coarse_update(self, player, board, steps: int) -> None:
+        self.swarm.update(player, board, [self.slot], steps)
+
+    def check_magma_damage(self, board) -> None:
+        self.swarm.magma_damage(board, [self.slot])
+
+    def attack(self, player) -> None:
+        if player.is_alive():
+            player.health -= self.damage
+            print(f"Player Health: {player.health}")
+
+    def push_back(self, dx: int, dy: int, board) -> None:
+        """Отталкиваем врага на 3 клетки."""
+        new_x = self.swarm.xs[self.slot] + dx * 3
+        new_y = self.swarm.ys[self.slot] + dy * 3
+        if board.map_data.is_passable(new_x, new_y) and not board.is_occupied(new_x, new_y, self):
+            self.swarm.move(self.slot, new_x, new_y)
+
+
+class EnemySwarm:
+    """
+    Все враги в параллельных массивах (structure of arrays):
+    xs, ys — клетка, health, damage, kinds — номер вида в KINDS.
+    Номер врага (slot) — индекс в этих массивах.
+
+    Ход, урон от магмы и атаки считаются за один проход по массивам
+    (update), без спрайта и Rect на каждого врага. Для отрисовки
+    blit_list отдаёт пары (картинка вида, позиция) только врагов в окне камеры.
+    """
+    def __init__(self) -> None:
+        self.xs = array('i')
+        self.ys = array('i')
+        self.health = array('i')
+        self.damage = array('i')
+        self.kinds = array('B')
+        self.facades = []
+
+        # Клетка -> slot живого врага в ней
+        self.cells = {}
+        # Свободные клетки Board (FreeCells), если заданы
+        self.free_cells = None
+
+        # Одна картинка на вид врага
+        self.kind_images = []
+        for _, _, _, color in KINDS:
+            image = pygame.Surface((TILE_SIZE, TILE_SIZE))
+            image.fill(color)
+            self.kind_images.append(image)
+
+    def add(self, enemy_class, tx: int, ty: int) -> SwarmEnemy:
+        """Добавляет врага вида enemy_class в клетку (tx, ty) и возвращает его фасад."""
+        kind = KIND_OF_CLASS[enemy_class]
+        _, health, damage, _ = KINDS[kind]
+        slot = len(self.xs)
+        self.xs.append(tx)
+        self.ys.append(ty)
+        self.health.append(health)
+        self.damage.append(damage)
+        self.kinds.append(kind)
+        self.occupy(slot, tx, ty)
+        facade = SwarmEnemy(self, slot)
+        self.facades.append(facade)
+        return facade
+
+    def set_health(self, slot: int, value: int) -> None:
+        was_alive = self.health[slot] > 0
+        self.health[slot] = value
+        if was_alive and value <= 0:
+            # Погибший враг сразу освобождает клетку
+            self.vacate(slot)
+
+    def occupy(self, slot: int, tx: int, ty: int) -> None:
+        self.cells[(tx, ty)] = slot
+        if self.free_cells is not None:
+            self.free_cells.occupy((tx, ty))
+
+    def vacate(self, slot: int) -> None:
+        tile = (self.xs[slot], self.ys[slot])
+        del self.cells[tile]
+        if self.free_cells is not None:
+            self.free_cells.vacate(tile)
+
+    def move(self, slot: int, tx: int, ty: int) -> None:
+        self.vacate(slot)
+        self.xs[slot] = tx
+        self.ys[slot] = ty
+        self.occupy(slot, tx, ty)
+
+    def alive_slots(self) -> list[int]:
+        health = self.health
+        return [slot for slot in range(len(health)) if health[slot] > 0]
+
+    # ---- запросы по клеткам ----
+
+    def entities_at(self, tx: int, ty: int) -> list:
+        slot = self.cells.get((tx, ty))
+        return [] if slot is None else [self.facades[slot]]
+
+    def is_occupied(self, tx: int, ty: int, ignore=None) -> bool:
+        slot = self.cells.get((tx, ty))
+        return slot is not None and self.facades[slot] is not ignore
+
+    def in_rect(self, x0: int, y0: int, x1: int, y1: int) -> list:
+        """Фасады врагов в прямоугольнике клеток (x1, y1 не входят)."""
+        return [self.facades[slot] for slot in self.slots_in_rect(x0, y0, x1, y1)]
+
+    def in_radius(self, tx: int, ty: int, radius: int) -> list:
+        """Фасады врагов не дальше radius шагов от клетки (tx, ty)."""
+        return [self.facades[slot]
+                for slot in self.slots_in_rect(tx - radius, ty - radius,
+                                               tx + radius + 1, ty + radius + 1)
+                if abs(self.xs[slot] - tx) + abs(self.ys[slot] - ty) <= radius]
+
+    def slots_in_rect(self, x0: int, y0: int, x1: int, y1: int) -> list[int]:
+        cells = self.cells
+        if (x1 - x0) * (y1 - y0) <= len(cells):
+            return [cells[(tx, ty)] for ty in range(y0, y1) for tx in range(x0, x1)
+                    if (tx, ty) in cells]
+        return [slot for (tx, ty), slot in cells.items()
+                if x0 <= tx < x1 and y0 <= ty < y1]
+
+    # ---- ход ----
+
+    def update(self, player, board, slots=None, steps: int = 1) -> None:
+        """
+        Ход врагов slots (по умолчанию всех живых) одним проходом:
+        шаг по общему полю расстояний до игрока, атака вплотную, магма.
+        Если путь загорожен другими врагами, враг ждёт (без обхода по A*).
+        steps > 1 — грубый ход на несколько клеток сразу (см. AIScheduler).
+        """
+        if slots is None:
+            slots = self.alive_slots()
+        px, py = player.rect.x // TILE_SIZE, player.rect.y // TILE_SIZE
+        field = board.get_distance_field((px, py))
+        map_data = board.map_data
+        width = map_data.width
+        xs, ys, health, damage = self.xs, self.ys, self.health, self.damage
+        cells = self.cells
+
+        attack = 0
+        for slot in slots:
+            if health[slot] <= 0:
+                continue
+            ex, ey = xs[slot], ys[slot]
+            dist = field[ey * width + ex]
+            if dist == 1:
+                # Вплотную: стоим и атакуем
+                attack += damage[slot]
+                continue
+            if dist == UNREACHABLE:
+                continue
+            x, y = ex, ey
+            for _ in range(steps):
+                step = next_step(field, map_data, x, y, cells)
+                if step is None:
+                    break
+                x, y = step
+            if (x, y) != (ex, ey):
+                self.move(slot, x, y)
+
+        if attack and player.is_alive():
+            player.health -= attack
+            print(f"Player Health: {player.health}")
+
+        self.magma_damage(board, slots)
+
+    def magma_damage(self, board, slots) -> None:
+        """Урон от магмы всем живым врагам slots, стоящим на магме."""
+        cells = board.map_data.cells
+        width = board.map_data.width
+        xs, ys, health = self.xs, self.ys, self.health
+        for slot in slots:
+            if health[slot] > 0 and cells[ys[slot] * width + xs[slot]] == 7:  # магма
+                self.set_health(slot, health[slot] - 5)
+
+    # ---- отрисовка ----
+
+    def blit_list(self, camera) -> list[tuple[pygame.Surface, tuple[int, int]]]:
+        """Пары (картинка, позиция на экране) врагов в окне камеры — для Surface.blits."""
+        x0, y0, x1, y1 = camera.visible_tiles(margin=0)
+        images, kinds, xs, ys = self.kind_images, self.kinds, self.xs, self.ys
+        left, top = camera.x, camera.y
+        return [(images[kinds[slot]], (xs[slot] * TILE_SIZE + left, ys[slot] * TILE_SIZE + top))
+                for slot in self.slots_in_rect(x0, y0, x1, y1)]
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Модули игры лежат в MyCode и импортируются по имени (from constants import *)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
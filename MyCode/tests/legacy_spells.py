@@ -0,0 +1,387 @@
+"""
+Заклинания до реестра SPELLS (if/elif на каждую комбинацию) —
+эталон для test_spells.py. Код оставлен как был, только снаряды
+теперь запускаются через board.projectiles.launch (projectile.py).
+"""
+import pygame
+from constants import *
+
+
+class Elements:
+    """
+    Обработка набора "стихий" (f, g, h, j) и применение заклинаний.
+
+    Параметры:
+    - set_element: список строк (обычно 'f', 'g', 'h', 'j'), где может быть 1 или 2 элемента
+    - angle: текущее направление игрока (0, 90, 180, 270)
+    - x, y: позиция игрока в пикселях
+    - board: объект карты (хранит map_data, set_tile и т.д.)
+    - player: сам игрок (для нанесения урона врагам, изменения здоровья и пр.)
+    - enemy: враг (если он есть рядом/на линии)
+    """
+
+    def __init__(self, set_element, angle, x, y, board, player, enemy) -> None:
+        # Сортируем, чтобы 'fg' == 'gf' и т.п.
+        self.set_element = sorted(set_element)
+        self.angle = angle
+        self.player_x = x
+        self.player_y = y
+        self.board = board
+        self.player = player
+        self.enemy = enemy
+
+    def set_elements(self) -> None:
+        """
+        Определяемся, какое заклинание вызвать, исходя из набора (1 или 2 символа).
+        """
+        combo = "".join(self.set_element)
+        if len(self.set_element) == 2:
+            # Дву-буквенные заклинания
+            if combo == "ff":
+                self.ff()
+            elif combo == "fg":
+                self.fg()
+            elif combo == "fh":
+                self.fh()
+            elif combo == "fj":
+                self.fj()
+            elif combo == "gg":
+                self.gg()
+            elif combo == "gh":
+                self.gh()
+            elif combo == "gj":
+                self.gj()
+            elif combo == "hh":
+                self.hh()
+            elif combo == "hj":
+                self.hj()
+            elif combo == "jj":
+                self.jj()
+        elif len(self.set_element) == 1:
+            # Одно-буквенные заклинания
+            e = self.set_element[0]
+            if e == 'f':
+                self.f()
+            elif e == 'g':
+                self.g()
+            elif e == 'h':
+                self.h()
+            elif e == 'j':
+                self.j()
+
+    # ----------------------------------------------------------------
+    # Ниже идут реализации конкретных заклинаний.
+    # Для каждого описываем логику, какую именно плитку/объект они меняют.
+    # ----------------------------------------------------------------
+
+    # ==== Однобуквенные заклинания ====
+
+    def f(self) -> None:
+        """
+        f — воздействие огнём на тайл перед игроком или на врага,
+        если он стоит в этой клетке.
+        """
+        dx, dy = self.get_direction()
+        tx = (self.player_x + dx) // TILE_SIZE
+        ty = (self.player_y + dy) // TILE_SIZE
+
+        tile_code = self.board.map_data.at(tx, ty)
+        if tile_code is None:
+            return
+
+        # Проверяем, не стоит ли там враг
+        if self.enemy and self.enemy.is_alive():
+            front_rect = pygame.Rect(self.player_x + dx, self.player_y + dy, TILE_SIZE, TILE_SIZE)
+            if front_rect.colliderect(self.enemy.rect):
+                self.enemy.health -= ENEMY_DAMAGE
+                print(f"Enemy Health: {self.enemy.health}")
+                return
+
+        # Логика воздействия на тайл
+        if tile_code == 0:
+            self.board.set_tile(tx, ty, 1)  # ground -> fire_ground
+        elif tile_code in (2, 4):
+            self.board.set_tile(tx, ty, 0)  # water_ground или fire_tree -> ground
+        elif tile_code == 3:
+            self.board.set_tile(tx, ty, 4)  # tree -> fire_tree
+        elif tile_code == 6:
+            self.board.set_tile(tx, ty, 2)  # water -> water_ground
+
+    def g(self) -> None:
+        """
+        g — воздействие "землёй" (камень) на ближайший тайл/врага.
+        """
+        dx, dy = self.get_direction()
+        tx = (self.player_x + dx) // TILE_SIZE
+        ty = (self.player_y + dy) // TILE_SIZE
+
+        tile_code = self.board.map_data.at(tx, ty)
+        if tile_code is None:
+            return
+        if self.enemy and self.enemy.is_alive():
+            front_rect = pygame.Rect(self.player_x + dx, self.player_y + dy, TILE_SIZE, TILE_SIZE)
+            if front_rect.colliderect(self.enemy.rect):
+                self.enemy.health -= ENEMY_DAMAGE
+                print(f"Enemy Health: {self.enemy.health}")
+                return
+
+        # Логика воздействия на тайл
+        if tile_code == 0:
+            self.board.set_tile(tx, ty, 5)  # ground -> rock
+        elif tile_code in (1, 2, 4):
+            self.board.set_tile(tx, ty, 0)  # fire_ground / water_ground / fire_tree -> ground
+        elif tile_code == 6:
+            self.board.set_tile(tx, ty, 2)  # water -> water_ground
+
+    def h(self) -> None:
+        """
+        h — воздействие водой/льдом на тайл перед игроком.
+        """
+        dx, dy = self.get_direction()
+        tx = (self.player_x + dx) // TILE_SIZE
+        ty = (self.player_y + dy) // TILE_SIZE
+
+        tile_code = self.board.map_data.at(tx, ty)
+        if tile_code is None:
+            return
+
+        if self.enemy and self.enemy.is_alive():
+            front_rect = pygame.Rect(self.player_x + dx, self.player_y + dy, TILE_SIZE, TILE_SIZE)
+            if front_rect.colliderect(self.enemy.rect):
+                self.enemy.health -= ENEMY_DAMAGE
+                print(f"Enemy Health: {self.enemy.health}")
+                return
+
+        # Логика воздействия на тайл
+        if tile_code == 0:
+            self.board.set_tile(tx, ty, 2)  # ground -> water_ground
+        elif tile_code == 1:
+            self.board.set_tile(tx, ty, 0)  # fire_ground -> ground
+        elif tile_code == 4:
+            self.board.set_tile(tx, ty, 3)  # fire_tree -> tree
+        elif tile_code == 7:
+            self.board.set_tile(tx, ty, 1)  # magma -> fire_ground
+
+    def j(self) -> None:
+        """
+        j — отталкивание врага, если он стоит перед игроком, на 3 клетки.
+        """
+        dx_px, dy_px = self.get_direction()
+        front_rect = pygame.Rect(self.player_x + dx_px, self.player_y + dy_px, TILE_SIZE, TILE_SIZE)
+        if self.enemy and self.enemy.is_alive() and front_rect.colliderect(self.enemy.rect):
+            tile_dx = dx_px // TILE_SIZE
+            tile_dy = dy_px // TILE_SIZE
+            self.enemy.push_back(tile_dx, tile_dy, self.board)
+
+    # ==== Двухбуквенные заклинания ====
+
+    def ff(self) -> None:
+        """
+        ff — "усиленный огонь": превращает несколько тайлов по направлению игрока.
+        Может, например, превращать ground -> fire_ground -> magma,
+        water_ground -> fire_ground, дерево -> сжигает и т.д.
+        """
+        dx, dy = self.get_direction()
+        steps = 3  # сколько тайлов пронзает заклинание
+        for i in range(1, steps + 1):
+            tx = (self.player_x + i * dx) // TILE_SIZE
+            ty = (self.player_y + i * dy) // TILE_SIZE
+
+            if not self.board.map_data.in_bounds(tx, ty):
+                break
+
+            # Если задели врага — прерываемся
+            if self.enemy and self.enemy.is_alive():
+                ex = self.enemy.rect.x // TILE_SIZE
+                ey = self.enemy.rect.y // TILE_SIZE
+                if (ex, ey) == (tx, ty):
+                    self.ff_transform(tx, ty)
+                    break
+
+            self.ff_transform(tx, ty)
+
+    def ff_transform(self, tx: int, ty: int) -> None:
+        """
+        Частная функция для ff: как именно меняем каждый тайл.
+        """
+        tile_code = self.board.map_data.get(tx, ty)
+        if tile_code in (0, 2):
+            self.board.set_tile(tx, ty, 1)  # ground/water_ground -> fire_ground
+        elif tile_code == 1:
+            self.board.set_tile(tx, ty, 7)  # fire_ground -> magma
+        elif tile_code in (3, 4, 6):
+            # дерево, сожжённое дерево, вода -> ground
+            self.board.set_tile(tx, ty, 0)
+
+    def fg(self) -> None:
+        """
+        fg — пример: превращает воду в огонь или сразу в магму и т.п.
+        (возможна любая логика).
+        """
+        dx, dy = self.get_direction()
+        tx = (self.player_x + dx) // TILE_SIZE
+        ty = (self.player_y + dy) // TILE_SIZE
+
+        tile_code = self.board.map_data.at(tx, ty)
+        if tile_code is None:
+            return
+        if tile_code == 6:
+            # вода -> fire_ground
+            self.board.set_tile(tx, ty, 1)
+        else:
+            # что угодно иное -> magma
+            self.board.set_tile(tx, ty, 7)
+
+    def fh(self) -> None:
+        """
+        fh — удар по площади (конус), например 3 клетки вперёд по ширине 3.
+        """
+        offsets = []
+        for i in range(1, 4):
+            for j in [-1, 0, 1]:
+                if self.angle == 0:
+                    cx = (self.player_x // TILE_SIZE) + j
+                    cy = (self.player_y // TILE_SIZE) - i
+                elif self.angle == 90:
+                    cx = (self.player_x // TILE_SIZE) - i
+                    cy = (self.player_y // TILE_SIZE) + j
+                elif self.angle == 180:
+                    cx = (self.player_x // TILE_SIZE) - j
+                    cy = (self.player_y // TILE_SIZE) + i
+                else:  # self.angle == 270
+                    cx = (self.player_x // TILE_SIZE) + i
+                    cy = (self.player_y // TILE_SIZE) - j
+
+                cell_coords = (cx, cy)
+                offsets.append(cell_coords)
+
+        # Если есть враг, проверяем, задели ли его
+        if self.enemy and self.enemy.is_alive():
+            ex, ey = (self.enemy.rect.x // TILE_SIZE, self.enemy.rect.y // TILE_SIZE)
+            for (cx, cy) in offsets:
+                if (cx, cy) == (ex, ey):
+                    self.enemy.health -= ENEMY_DAMAGE
+                    print(f"Enemy Health: {self.enemy.health}")
+                    break
+
+    def fj(self) -> None:
+        """
+        fj — бросок фаербола (снаряд) по направлению игрока.
+        """
+        self.board.projectiles.launch(self.player_x // TILE_SIZE, self.player_y // TILE_SIZE,
+                                      self.angle, "fj", 1)
+
+    def gg(self) -> None:
+        """
+        gg — создаёт "каменную стену" из 3 тайлов сбоку перед игроком.
+        """
+        px = self.player_x // TILE_SIZE
+        py = self.player_y // TILE_SIZE
+
+        if self.angle == 0:
+            coords = [(px - 1, py - 1),
+                      (px, py - 1),
+                      (px + 1, py - 1)]
+        elif self.angle == 90:
+            coords = [(px - 1, py + 1),
+                      (px - 1, py),
+                      (px - 1, py - 1)]
+        elif self.angle == 180:
+            coords = [(px + 1, py + 1),
+                      (px, py + 1),
+                      (px - 1, py + 1)]
+        elif self.angle == 270:
+            coords = [(px + 1, py - 1),
+                      (px + 1, py),
+                      (px + 1, py + 1)]
+
+        for (cx, cy) in coords:
+            if self.board.map_data.in_bounds(cx, cy):
+                self.board.set_tile(cx, cy, 5)
+
+    def gh(self) -> None:
+        """
+        gh — пример: создаёт дерево (3) перед игроком,
+        если там не магма (7). Если была магма, можно оставить как есть или выдумать логику.
+        """
+        dx, dy = self.get_direction()
+        tx = (self.player_x + dx) // TILE_SIZE
+        ty = (self.player_y + dy) // TILE_SIZE
+
+        tile_code = self.board.map_data.at(tx, ty)
+        if tile_code is None:
+            return
+        if tile_code != 7:  # не магма
+            self.board.set_tile(tx, ty, 3)  # сажаем дерево
+
+    def gj(self) -> None:
+        """
+        gj — метнуть каменный "снаряд" (Projectile).
+        """
+        self.board.projectiles.launch(self.player_x // TILE_SIZE, self.player_y // TILE_SIZE,
+                                      self.angle, "gj", 1)
+
+    def hh(self) -> None:
+        """
+        hh — мощное водяное заклинание, которое превращает несколько тайлов в воду/убирает огонь и т.д.
+        """
+        dx, dy = self.get_direction()
+        steps = 3
+        for i in range(1, steps + 1):
+            tx = (self.player_x + i * dx) // TILE_SIZE
+            ty = (self.player_y + i * dy) // TILE_SIZE
+            tile_code = self.board.map_data.at(tx, ty)
+            if tile_code == 0:
+                self.board.set_tile(tx, ty, 2)  # ground -> water_ground
+            elif tile_code in (1, 7):
+                self.board.set_tile(tx, ty, 0)  # fire_ground/magma -> ground
+            elif tile_code == 2:
+                self.board.set_tile(tx, ty, 6)  # water_ground -> water
+            elif tile_code == 4:
+                self.board.set_tile(tx, ty, 3)  # fire_tree -> tree
+
+    def hj(self) -> None:
+        """
+        hj — восполняет здоровье игрока.
+        """
+        heal_amount = 30
+        old_health = self.player.health
+        self.player.health = min(HEALTH, self.player.health + heal_amount)
+        print(f"Healed player from {old_health} to {self.player.health}")
+
+    def jj(self) -> None:
+        """
+        jj — "рывок" игрока на 2 тайла вперёд, если это возможно; иначе на 1.
+        """
+        dx, dy = self.get_direction()
+        tx2 = (self.player_x + 2 * dx) // TILE_SIZE
+        ty2 = (self.player_y + 2 * dy) // TILE_SIZE
+        tx1 = (self.player_x + dx) // TILE_SIZE
+        ty1 = (self.player_y + dy) // TILE_SIZE
+
+        # Проверяем 2 клетки вперёд
+        if (self.board.map_data.is_passable(tx2, ty2)
+                and not self.board.is_occupied(tx2, ty2, self.player)):
+            self.player.move_to(tx2, ty2)
+            return
+
+        # Иначе проверяем хотя бы 1 клетку
+        if (self.board.map_data.is_passable(tx1, ty1)
+                and not self.board.is_occupied(tx1, ty1, self.player)):
+            self.player.move_to(tx1, ty1)
+
+
+    def get_direction(self) -> tuple[int, int]:
+        """
+        Возвращает смещение (dx, dy) в пикселях (кратно TILE_SIZE)
+        в зависимости от угла (0, 90, 180, 270).
+        """
+        if self.angle == 0:
+            return 0, -TILE_SIZE
+        elif self.angle == 90:
+            return -TILE_SIZE, 0
+        elif self.angle == 180:
+            return 0, TILE_SIZE
+        elif self.angle == 270:
+            return TILE_SIZE, 0
+        return 0, 0
\ No newline at end of file
@@ -0,0 +1,29 @@
+import os
+
+import pygame
+
+from assets import AssetManager
+
+
+def test_add_fills_free_shelves_before_new_page(tmp_path):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    for name, size in (('tall', (40, 64)), ('small', (32, 32))):
+        pygame.image.save(pygame.Surface(size, pygame.SRCALPHA), str(tmp_path / f'{name}.png'))
+    assets = AssetManager((str(tmp_path),))
+    memory = assets.texture_memory()
+
+    # Маленькие картинки ложатся в остаток полки, страница не добавляется
+    dot = pygame.Surface((16, 16), pygame.SRCALPHA)
+    dot.fill((255, 0, 0, 255))
+    for i in range(10):
+        assets.add(f'dot{i}', dot)
+    assert len(assets.pages) == 1
+    assert assets.texture_memory() == memory
+    assert assets.image('dot9').get_at((0, 0)) == (255, 0, 0, 255)
+
+    # Не влезающая картинка получает страницу ровно по своему размеру
+    assets.add('big', pygame.Surface((100, 100), pygame.SRCALPHA))
+    assert assets.pages[-1].get_size() == (100, 100)
+    assert assets.texture_memory() == memory + 100 * 100 * 4
@@ -0,0 +1,59 @@
+import random
+
+from grid import TileGrid
+from connectivity import ConnectivityLabels, NO_COMPONENT
+
+GROUND = 0
+ROCK = 5
+
+
+def same_partition(labels: ConnectivityLabels, fresh: ConnectivityLabels) -> bool:
+    """Метки после обновлений делят клетки на области так же, как разметка с нуля."""
+    pairs = {}
+    for i, label in enumerate(fresh.labels):
+        own = labels.labels[i]
+        if (label == NO_COMPONENT) != (own == NO_COMPONENT):
+            return False
+        if label == NO_COMPONENT:
+            continue
+        root = labels.find(own)
+        if pairs.setdefault(label, root) != root:
+            return False
+    # Разные области с нуля не должны иметь общий корень
+    return len(set(pairs.values())) == len(pairs)
+
+
+def set_tiles(grid: TileGrid, labels: ConnectivityLabels, tiles) -> None:
+    """Как Board.set_tiles: сначала все записи в карту, потом одно обновление меток."""
+    flipped = []
+    for x, y, code in tiles:
+        was_passable = grid.is_passable(x, y)
+        grid.set(x, y, code)
+        if grid.is_passable(x, y) != was_passable:
+            flipped.append((x, y))
+    labels.update_many(flipped)
+
+
+def test_adjacent_cells_blocked_in_one_batch():
+    # ..
+    # .#
+    # ..
+    grid = TileGrid(2, 3, bytes([GROUND, GROUND, GROUND, ROCK, GROUND, GROUND]))
+    labels = ConnectivityLabels(grid)
+    set_tiles(grid, labels, [(0, 1, ROCK), (0, 2, ROCK)])
+    assert not labels.connected((0, 0), (1, 2))
+    assert same_partition(labels, ConnectivityLabels(grid))
+
+
+def test_multi_cell_batches_match_full_rebuild():
+    rng = random.Random(1)
+    for _ in range(1500):
+        width, height = rng.randint(2, 7), rng.randint(2, 7)
+        cells = bytes(ROCK if rng.random() < 0.3 else GROUND for _ in range(width * height))
+        grid = TileGrid(width, height, cells)
+        labels = ConnectivityLabels(grid)
+        for _ in range(3):
+            tiles = [(rng.randrange(width), rng.randrange(height), rng.choice((GROUND, ROCK)))
+                     for _ in range(rng.randint(1, 6))]
+            set_tiles(grid, labels, tiles)
+            assert same_partition(labels, ConnectivityLabels(grid)), (width, height, cells, tiles)
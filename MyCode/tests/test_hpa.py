@@ -0,0 +1,103 @@
+import random
+
+from grid import TileGrid
+from hpa import HierarchicalPlanner
+from pathfinding import bfs, PathCache
+from characters import WeakEnemy
+from constants import TILE_SIZE
+
+GROUND = 0
+ROCK = 5
+
+
+def full_path(path) -> list[tuple[int, int]] | None:
+    """Уточняет все отрезки HierarchicalPath."""
+    while path.refine_next():
+        pass
+    return None if path.waypoints else path.cells
+
+
+def is_walk(path, grid: TileGrid, start, goal) -> bool:
+    """Путь идёт шагами в 4 стороны по проходимым клеткам (кроме, может быть, цели)."""
+    return (path[0] == start and path[-1] == goal
+            and all(abs(x1 - x2) + abs(y1 - y2) == 1 for (x1, y1), (x2, y2) in zip(path, path[1:]))
+            and all(grid.is_passable(x, y) for x, y in path[:-1]))
+
+
+def test_impassable_goal_reached_from_neighbour_cluster():
+    # Кластеры по 4 клетки: цель (3, 0) — камень, её единственный
+    # проходимый сосед (4, 0) лежит уже в соседнем кластере
+    grid = TileGrid(8, 1, bytes([GROUND, GROUND, ROCK, ROCK, GROUND, GROUND, GROUND, GROUND]))
+    planner = HierarchicalPlanner(grid, 4)
+    path = planner.find_path((7, 0), (3, 0))
+    assert path is not None
+    assert full_path(path) == bfs((7, 0), (3, 0), grid)
+
+
+def test_paths_agree_with_bfs():
+    rng = random.Random(5)
+    for _ in range(40):
+        size = rng.choice((12, 20, 40))
+        grid = TileGrid(size, size, bytes(ROCK if rng.random() < 0.3 else GROUND
+                                          for _ in range(size * size)))
+        planner = HierarchicalPlanner(grid, rng.choice((4, 8)))
+        for _ in range(30):
+            start = (rng.randrange(size), rng.randrange(size))
+            goal = (rng.randrange(size), rng.randrange(size))
+            if not grid.is_passable(*start):
+                continue
+            expected = bfs(start, goal, grid)
+            path = planner.find_path(start, goal)
+            path = full_path(path) if path else None
+            assert (path is None) == (expected is None), (size, start, goal)
+            if path:
+                assert is_walk(path, grid, start, goal)
+
+
+def test_changed_cluster_is_rebuilt():
+    grid = TileGrid(12, 12)
+    planner = HierarchicalPlanner(grid, 4)
+    # Стена поперёк карты отрезает нижнюю половину
+    for x in range(12):
+        grid.set(x, 6, ROCK)
+        planner.invalidate(x, 6)
+    assert planner.find_path((0, 0), (11, 11)) is None
+    grid.set(5, 6, GROUND)
+    planner.invalidate(5, 6)
+    assert is_walk(full_path(planner.find_path((0, 0), (11, 11))), grid, (0, 0), (11, 11))
+
+
+class FakeBoard:
+    """Ровно то, что Enemy.follow_path берёт у Board."""
+    def __init__(self, map_data: TileGrid, cluster_size: int) -> None:
+        self.map_data = map_data
+        self.planner = HierarchicalPlanner(map_data, cluster_size)
+        self.terrain_version = 0
+        self.path_cache = PathCache(16)
+        self.queries = 0
+
+    def find_path(self, start, goal, blocked=None):
+        self.queries += 1
+        return self.planner.find_path(start, goal)
+
+
+def test_enemy_refines_segments_on_demand():
+    grid = TileGrid(40, 40)
+    board = FakeBoard(grid, 8)
+    enemy = WeakEnemy(0, 0)
+    goal = (39, 39)
+
+    step = enemy.follow_path((0, 0), goal, board, set())
+    # Уточнён только первый отрезок, остальные ждут
+    assert enemy.waypoints
+    assert enemy.path[-1] != goal
+
+    steps = 1
+    while step:
+        enemy.move_to(*step)
+        step = enemy.follow_path(step, goal, board, set())
+        steps += 1
+    # Дошёл до клетки рядом с целью по одному найденному пути
+    assert (enemy.rect.x // TILE_SIZE, enemy.rect.y // TILE_SIZE) in {(38, 39), (39, 38)}
+    assert steps == 78
+    assert board.queries == 1
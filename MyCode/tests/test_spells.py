@@ -0,0 +1,91 @@
+import random
+
+import pygame
+
+from grid import TileGrid
+from characters import WeakEnemy
+from constants import TILE_SIZE, HEALTH
+from spells import ELEMENTS
+from legacy_spells import Elements as LegacyElements
+
+COMBOS = ['f', 'g', 'h', 'j', 'ff', 'fg', 'fh', 'fj', 'gg', 'gh', 'gj', 'hh', 'hj', 'jj', 'gf', 'hf']
+
+
+class FakeProjectiles:
+    def __init__(self) -> None:
+        self.launched = []
+
+    def launch(self, tx: int, ty: int, angle: int, kind: str, speed: int) -> None:
+        self.launched.append((tx, ty, angle, kind, speed))
+
+
+class FakePlayer:
+    def __init__(self, tx: int, ty: int, health: int) -> None:
+        self.rect = pygame.Rect(tx * TILE_SIZE, ty * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        self.health = health
+
+    def move_to(self, tx: int, ty: int) -> None:
+        self.rect.topleft = (tx * TILE_SIZE, ty * TILE_SIZE)
+
+
+class FakeBoard:
+    """Ровно то, что заклинания берут у Board: карта, враг, игрок и снаряды."""
+    def __init__(self, map_data: TileGrid, player: FakePlayer, enemy) -> None:
+        self.map_data = map_data
+        self.player = player
+        self.enemy = enemy
+        self.projectiles = FakeProjectiles()
+
+    def set_tile(self, x: int, y: int, code: int) -> None:
+        self.map_data.set(x, y, code)
+
+    def set_tiles(self, tiles) -> None:
+        for x, y, code in tiles:
+            self.map_data.set(x, y, code)
+
+    def enemies_at(self, tx: int, ty: int) -> list:
+        enemy = self.enemy
+        if enemy.is_alive() and (enemy.rect.x // TILE_SIZE, enemy.rect.y // TILE_SIZE) == (tx, ty):
+            return [enemy]
+        return []
+
+    def is_occupied(self, tx: int, ty: int, ignore=None) -> bool:
+        return any(who is not ignore and (who.rect.x // TILE_SIZE, who.rect.y // TILE_SIZE) == (tx, ty)
+                   for who in (self.player, self.enemy))
+
+
+def random_scene(rng: random.Random) -> tuple:
+    """Случайная маленькая карта, игрок и враг не дальше 3 клеток от него."""
+    width, height = rng.randint(3, 12), rng.randint(3, 12)
+    cells = bytes(rng.randrange(8) for _ in range(width * height))
+    player = (rng.randrange(width), rng.randrange(height))
+    enemy = player
+    while enemy == player:
+        enemy = (min(max(player[0] + rng.randint(-3, 3), 0), width - 1),
+                 min(max(player[1] + rng.randint(-3, 3), 0), height - 1))
+    return width, height, cells, player, rng.randint(10, HEALTH), enemy
+
+
+def play(scene: tuple, combo: str, angle: int, legacy: bool) -> tuple:
+    """Каст в свежей копии сцены. Возвращает всё, что заклинание могло изменить."""
+    width, height, cells, (px, py), health, (ex, ey) = scene
+    grid = TileGrid(width, height, cells)
+    player = FakePlayer(px, py, health)
+    enemy = WeakEnemy(ex * TILE_SIZE, ey * TILE_SIZE)
+    board = FakeBoard(grid, player, enemy)
+    if legacy:
+        LegacyElements(list(combo), angle, player.rect.x, player.rect.y, board, player, enemy).set_elements()
+    else:
+        ELEMENTS.cast(list(combo), angle, player.rect.x, player.rect.y, board, player)
+    return (bytes(grid.cells), player.rect.topleft, player.health,
+            enemy.rect.topleft, enemy.health, board.projectiles.launched)
+
+
+def test_registry_matches_legacy_spells():
+    rng = random.Random(3)
+    for _ in range(3000):
+        scene = random_scene(rng)
+        combo = rng.choice(COMBOS)
+        angle = rng.choice((0, 90, 180, 270))
+        assert play(scene, combo, angle, legacy=False) == play(scene, combo, angle, legacy=True), \
+            (scene, combo, angle)
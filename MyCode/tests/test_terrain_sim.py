@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from grid import TileGrid
+import terrain_sim
+from terrain_sim import TerrainSim
+
+
+class FakeBoard:
+    """Ровно то, что TerrainSim берёт у Board."""
+    def __init__(self, map_data: TileGrid) -> None:
+        self.map_data = map_data
+
+    def set_tiles(self, tiles) -> None:
+        for x, y, code in tiles:
+            self.map_data.set(x, y, code)
+
+
+def test_numpy_and_python_steps_agree():
+    if terrain_sim.np is None:
+        pytest.skip("numpy не установлен")
+    rng = random.Random(1)
+    for _ in range(300):
+        width, height = rng.randint(1, 20), rng.randint(1, 20)
+        grid = TileGrid(width, height, bytes(rng.randrange(8) for _ in range(width * height)))
+        sim = TerrainSim(FakeBoard(grid))
+        active = {(rng.randrange(width), rng.randrange(height)) for _ in range(rng.randint(1, 40))}
+        expected = sorted(sim.step_python(active))
+        assert sorted(sim.step_numpy(active, min_group=1)) == expected
+        assert sorted(sim.step_numpy(active)) == expected
+
+
+def test_load_time_state_is_simulated():
+    # Дерево рядом с огнём загорается на первом же шаге, без изменений на карте
+    grid = TileGrid(3, 1, bytes([3, 1, 0]))
+    sim = TerrainSim(FakeBoard(grid))
+    sim.step()
+    assert grid.get(0, 0) == 4